@@ -5,14 +5,42 @@ This package provides a registry for Hatch packages, handling package validation
 dependency resolution, and differential storage of package versions.
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .registry_core import RegistryCore, RegistryCoreError
+    from .registry_diff import RegistryDiff, RegistryDiffError
+    from .registry_validator import RegistryValidator, RegistryValidationError
+    from .registry_updater import RegistryUpdater, RegistryUpdateError
+    from .registry_cli import main
+
 __version__ = "0.1.0"
 
-# Import main components
-from .registry_core import RegistryCore, RegistryCoreError
-from .registry_diff import RegistryDiff, RegistryDiffError  
-from .registry_validator import RegistryValidator, RegistryValidationError
-from .registry_updater import RegistryUpdater, RegistryUpdateError
-from .registry_cli import main
+# Main components, imported from their submodule on first access (PEP 562)
+# so that importing the package, e.g. to run the CLI, stays cheap
+_LAZY_ATTRIBUTES = {
+    'RegistryCore': 'registry_core',
+    'RegistryCoreError': 'registry_core',
+    'RegistryDiff': 'registry_diff',
+    'RegistryDiffError': 'registry_diff',
+    'RegistryValidator': 'registry_validator',
+    'RegistryValidationError': 'registry_validator',
+    'RegistryUpdater': 'registry_updater',
+    'RegistryUpdateError': 'registry_updater',
+    'main': 'registry_cli',
+}
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
 __all__ = [
     'RegistryCore', 'RegistryCoreError',
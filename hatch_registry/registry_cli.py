@@ -1,149 +1,338 @@
 import sys
-import argparse
+import json
 import logging
 from pathlib import Path
+from types import SimpleNamespace
 
-from .registry_updater import RegistryUpdater
+_JSON_FLAG = ('--json', 'Print the result as compact JSON instead of a human-readable listing')
 
-def main():
-    """Main entry point for registry CLI."""
-    # Create the parser
-    parser = argparse.ArgumentParser(description='Hatch Registry Updater')
-    subparsers = parser.add_subparsers(dest='command', help='Commands')
+# Command name -> (help, ((option, required, help), ...), ((flag, help), ...)),
+# in the order commands are listed in the help output
+_COMMANDS = {
+    'add-repository': ('Add a new repository', (
+        ('--name', True, 'Repository name'),
+        ('--url', True, 'Repository URL'),
+    ), ()),
+    'add-package': ('Performs validation and add a new package', (
+        ('--repository-name', True, 'Repository name'),
+        ('--package-dir', True, 'Path to package directory'),
+        ('--author-github-id', False, 'GitHub ID of the package author'),
+        ('--author-email', False, 'Email of the package author'),
+    ), ()),
+    'list-repositories': ('List all repositories', (), (_JSON_FLAG,)),
+    'list-packages': ('List packages in a repository', (
+        ('--repository-name', True, 'Repository name'),
+    ), (_JSON_FLAG,)),
+    'show-package': ('Show package details', (
+        ('--repository-name', True, 'Repository name'),
+        ('--package-name', True, 'Package name'),
+    ), (_JSON_FLAG,)),
+    'validate-package': ('Validate whether a package can be added to the registry.', (
+        ('--repository-name', True, 'Repository name'),
+        ('--package-dir', True, 'Path to package directory'),
+    ), ()),
+}
+
+_DEFAULT_REGISTRY = "./data/hatch_packages_registry.json"
+# Accepted --log-level names mapped to their logging level, resolved once at import
+_LOG_LEVELS = {name: getattr(logging, name) for name in ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')}
+
+# Top-level options mapped to their destination, and their defaults
+_GLOBAL_OPTIONS = {'--registry': 'registry', '--log-level': 'log_level'}
+_GLOBAL_DEFAULTS = {'registry': _DEFAULT_REGISTRY, 'log_level': 'INFO'}
+_GLOBAL_VALUE_PREFIXES = tuple(opt + '=' for opt in _GLOBAL_OPTIONS)
+
+# Destinations of options holding filesystem paths, converted to Path once while parsing
+_PATH_DESTS = frozenset({'registry', 'package_dir'})
+
+def _option_dest(option):
+    return option[2:].replace('-', '_')
+
+def _consume_option(argv, i, options, values):
+    """
+    Store the value of the `--option value` or `--option=value` pair starting at argv[i].
     
-    # Add repository command
-    add_repo_parser = subparsers.add_parser('add-repository', help='Add a new repository')
-    add_repo_parser.add_argument('--name', required=True, help='Repository name')
-    add_repo_parser.add_argument('--url', required=True, help='Repository URL')
+    Returns:
+        int: Index of the next unread argument, or None if argv[i] is not a well-formed known option
+    """
+    option, has_value, value = argv[i].partition('=')
+    dest = options.get(option)
+    if dest is None:
+        return None
+    if not has_value:
+        i += 1
+        if i >= len(argv) or argv[i].startswith('-'):
+            return None
+        value = argv[i]
+    values[dest] = value
+    return i + 1
+
+def _parse_args_fast(argv):
+    """
+    Parse a well-formed command line without going through argparse.
+    
+    Only exact option names in `--option value` or `--option=value` form, and exact
+    flag names, are accepted.
+    Anything else (help flags, abbreviations, unknown or missing options, invalid
+    choices) is left to argparse so that its usage and error messages are preserved.
     
-    # Add package command
-    add_pkg_parser = subparsers.add_parser('add-package', help='Performs validation and add a new package')
-    add_pkg_parser.add_argument('--repository-name', required=True, help='Repository name')
-    add_pkg_parser.add_argument('--package-dir', required=True, help='Path to package directory')
-    add_pkg_parser.add_argument('--author-github-id', help='GitHub ID of the package author')
-    add_pkg_parser.add_argument('--author-email', help='Email of the package author')
+    Args:
+        argv: Command line arguments, without the program name
+        
+    Returns:
+        SimpleNamespace: Parsed arguments, or None if argparse must handle the command line
+    """
+    values = dict(_GLOBAL_DEFAULTS)
+    i, command = 0, None
+    while i < len(argv):
+        if not argv[i].startswith('-'):
+            command = argv[i]
+            i += 1
+            break
+        i = _consume_option(argv, i, _GLOBAL_OPTIONS, values)
+        if i is None:
+            return None
     
-    # List repositories command
-    list_repos_parser = subparsers.add_parser('list-repositories', help='List all repositories')
+    if command not in _COMMANDS:
+        return None
     
-    # List packages command
-    list_pkgs_parser = subparsers.add_parser('list-packages', help='List packages in a repository')
-    list_pkgs_parser.add_argument('--repository-name', required=True, help='Repository name')
+    _, command_options, command_flags = _COMMANDS[command]
+    options = {}
+    for option, required, _ in command_options:
+        options[option] = _option_dest(option)
+        if not required:
+            values[options[option]] = None
+    flags = {}
+    for flag, _ in command_flags:
+        flags[flag] = _option_dest(flag)
+        values[flags[flag]] = False
+    while i < len(argv):
+        if argv[i] in flags:
+            values[flags[argv[i]]] = True
+            i += 1
+            continue
+        i = _consume_option(argv, i, options, values)
+        if i is None:
+            return None
     
-    # Show package command
-    show_pkg_parser = subparsers.add_parser('show-package', help='Show package details')
-    show_pkg_parser.add_argument('--repository-name', required=True, help='Repository name')
-    show_pkg_parser.add_argument('--package-name', required=True, help='Package name')
+    for option, required, _ in command_options:
+        if required and options[option] not in values:
+            return None
+    if values['log_level'] not in _LOG_LEVELS:
+        return None
+    
+    for dest in _PATH_DESTS.intersection(values):
+        values[dest] = Path(values[dest])
+    
+    values['command'] = command
+    return SimpleNamespace(**values)
+
+def _build_subparser(subparsers, command):
+    help_text, options, flags = _COMMANDS[command]
+    command_parser = subparsers.add_parser(command, help=help_text)
+    for option, required, option_help in options:
+        option_type = Path if _option_dest(option) in _PATH_DESTS else None
+        command_parser.add_argument(option, required=required, type=option_type, help=option_help)
+    for flag, flag_help in flags:
+        command_parser.add_argument(flag, action='store_true', help=flag_help)
+
+def _make_log_level_type():
+    """
+    Build the argparse type for --log-level, validating with a dict lookup in _LOG_LEVELS
+    rather than a scan of a choices list. Error messages match argparse's own for choices.
+    """
+    import argparse
+    
+    def log_level(value):
+        if value not in _LOG_LEVELS:
+            choices = ', '.join(map(repr, _LOG_LEVELS))
+            raise argparse.ArgumentTypeError(f"invalid choice: {value!r} (choose from {choices})")
+        return value
+    
+    return log_level
+
+def _parse_args_argparse(argv):
+    """
+    Parse the command line with argparse, printing help and exiting when no command is given.
+    
+    Args:
+        argv: Command line arguments, without the program name
+        
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    # argparse is imported here rather than at module level: the CLI only needs it for
+    # command lines the fast path cannot parse, and library users never need it
+    import argparse
+    
+    # Create the parser
+    parser = argparse.ArgumentParser(description='Hatch Registry Updater')
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
     
-    # Validate package command
-    validate_pkg_parser = subparsers.add_parser('validate-package', help='Validate whether a package can be added to the registry.')
-    validate_pkg_parser.add_argument('--repository-name', required=True, help='Repository name')
-    validate_pkg_parser.add_argument('--package-dir', required=True, help='Path to package directory')
+    # This path only runs for help and usage errors, so build every subparser
+    # to keep the usage line and help output complete
+    for command in _COMMANDS:
+        _build_subparser(subparsers, command)
     
     # Common args
     parser.add_argument('--registry',
-                        default="./data/hatch_packages_registry.json",
+                        type=Path,
+                        default=_DEFAULT_REGISTRY,
                         help='Path to registry file. Default (./data/hatch_packages_registry.json) is relative to "/Hatch-Registry"')
     parser.add_argument('--log-level', 
-                      choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
+                      type=_make_log_level_type(),
+                      metavar='{' + ','.join(_LOG_LEVELS) + '}',
                       default='INFO', 
                       help='Set the logging level')
     
     # Parse arguments
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     if not args.command:
         parser.print_help()
         sys.exit(1)
     
+    return args
+
+
+def _write_lines(lines):
+    """Write the lines of a listing to stdout in a single call."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def _write_json(payload):
+    """Write registry data to stdout as compact JSON, for scripted consumers."""
+    sys.stdout.write(json.dumps(payload, separators=(",", ":")) + "\n")
+
+def _cmd_add_repository(updater, args):
+    success = updater.core.add_repository(args.name, args.url)
+    if not success:
+        print(f"Failed to add repository {args.name}")
+        return 1
+    return 0
+
+def _cmd_add_package(updater, args):
+    # Prepare author information if provided
+    author = None
+    if args.author_github_id or args.author_email:
+        author = {}
+        if args.author_github_id:
+            author["GitHubID"] = args.author_github_id
+        if args.author_email:
+            author["email"] = args.author_email
+    
+    success, _ = updater.validate_and_add_package(
+        args.repository_name, 
+        args.package_dir,
+        author=author
+    )
+    
+    if not success:
+        print(f"Failed to add package to repository {args.repository_name}")
+        return 1
+    return 0
+
+def _cmd_list_repositories(updater, args):
+    repositories = updater.core.registry_data.get("repositories", [])
+    if args.json:
+        _write_json(repositories)
+        return 0
+    
+    lines = [f"Repositories ({len(repositories)}):"]
+    for repo in repositories:
+        lines.append(f"  - {repo['name']}: {repo['url']}")
+        lines.append(f"    Packages: {len(repo.get('packages', []))}")
+        lines.append(f"    Last indexed: {repo.get('last_indexed', 'Never')}")
+    _write_lines(lines)
+    return 0
+
+def _cmd_list_packages(updater, args):
+    repo = updater.core.find_repository(args.repository_name)
+    if not repo:
+        print(f"Repository not found: {args.repository_name}")
+        return 1
+        
+    packages = repo.get("packages", [])
+    if args.json:
+        _write_json(packages)
+        return 0
+    
+    lines = [f"Packages in {args.repository_name} ({len(packages)}):"]
+    for pkg in packages:
+        lines.append(f"  - {pkg['name']} ({pkg.get('latest_version', 'No version')})")
+        lines.append(f"    Description: {pkg.get('description', 'No description')}")
+        lines.append(f"    Versions: {len(pkg.get('versions', []))}")
+    _write_lines(lines)
+    return 0
+
+def _cmd_show_package(updater, args):
+    pkg = updater.core.find_package(args.repository_name, args.package_name)
+    if not pkg:
+        print(f"Package not found: {args.package_name} in repository {args.repository_name}")
+        return 1
+    
+    if args.json:
+        _write_json(pkg)
+        return 0
+        
+    versions = pkg.get('versions', [])
+    lines = [
+        f"Package: {pkg['name']}",
+        f"Description: {pkg.get('description', 'No description')}",
+        f"Tags: {', '.join(pkg.get('tags', []))}",
+        f"Latest version: {pkg.get('latest_version', 'No version')}",
+        f"Versions ({len(versions)}):",
+    ]
+    for version in versions:
+        lines.append(f"  - {version.get('version', 'Unknown')}")
+        lines.append(f"    Added: {version.get('added_date', 'Unknown')}")
+    _write_lines(lines)
+    return 0
+
+def _cmd_validate_package(updater, args):
+    is_valid, _ = updater.validate_package(args.repository_name, args.package_dir)
+    if not is_valid:
+        print(f"Package validation failed: {args.package_dir}")
+        return 1
+    return 0
+
+# Command name -> handler returning the process exit code
+_HANDLERS = {
+    'add-repository': _cmd_add_repository,
+    'add-package': _cmd_add_package,
+    'list-repositories': _cmd_list_repositories,
+    'list-packages': _cmd_list_packages,
+    'show-package': _cmd_show_package,
+    'validate-package': _cmd_validate_package,
+}
+
+def main():
+    """Main entry point for registry CLI."""
+    # Well-formed command lines skip argparse entirely; it only runs for
+    # help, usage errors and option forms the fast path does not handle
+    argv = sys.argv[1:]
+    args = _parse_args_fast(argv)
+    if args is None:
+        args = _parse_args_argparse(argv)
+    
     # Configure logging
     logging.basicConfig(
-        level=getattr(logging, args.log_level),
+        level=_LOG_LEVELS[args.log_level],
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
     # Process commands
     try:
-        registry_path = Path(args.registry)
-        updater = RegistryUpdater(registry_path)
+        # Imported here so that help and usage errors do not pay for loading the registry modules
+        from .registry_updater import RegistryUpdater
         
-        if args.command == 'add-repository':
-            success = updater.core.add_repository(args.name, args.url)
-            if not success:
-                print(f"Failed to add repository {args.name}")
-                sys.exit(1)
-            sys.exit(0)
+        updater = RegistryUpdater(args.registry)
         
-        elif args.command == 'add-package':
-            # Prepare author information if provided
-            author = None
-            if args.author_github_id or args.author_email:
-                author = {}
-                if args.author_github_id:
-                    author["GitHubID"] = args.author_github_id
-                if args.author_email:
-                    author["email"] = args.author_email
-            
-            success, _ = updater.validate_and_add_package(
-                args.repository_name, 
-                Path(args.package_dir),
-                author=author
-            )
-            
-            if not success:
-                print(f"Failed to add package to repository {args.repository_name}")
-                sys.exit(1)
-            sys.exit(0)
-            
-        elif args.command == 'list-repositories':
-            repositories = updater.core.registry_data.get("repositories", [])
-            print(f"Repositories ({len(repositories)}):")
-            for repo in repositories:
-                print(f"  - {repo['name']}: {repo['url']}")
-                print(f"    Packages: {len(repo.get('packages', []))}")
-                print(f"    Last indexed: {repo.get('last_indexed', 'Never')}")
-            sys.exit(0)
-            
-        elif args.command == 'list-packages':
-            repo = updater.core.find_repository(args.repository_name)
-            if not repo:
-                print(f"Repository not found: {args.repository_name}")
-                sys.exit(1)
-                
-            packages = repo.get("packages", [])
-            print(f"Packages in {args.repository_name} ({len(packages)}):")
-            for pkg in packages:
-                print(f"  - {pkg['name']} ({pkg.get('latest_version', 'No version')})")
-                print(f"    Description: {pkg.get('description', 'No description')}")
-                print(f"    Versions: {len(pkg.get('versions', []))}")
-            sys.exit(0)
-            
-        elif args.command == 'show-package':
-            pkg = updater.core.find_package(args.repository_name, args.package_name)
-            if not pkg:
-                print(f"Package not found: {args.package_name} in repository {args.repository_name}")
-                sys.exit(1)
-                
-            print(f"Package: {pkg['name']}")
-            print(f"Description: {pkg.get('description', 'No description')}")
-            print(f"Tags: {', '.join(pkg.get('tags', []))}")
-            print(f"Latest version: {pkg.get('latest_version', 'No version')}")
-            print(f"Versions ({len(pkg.get('versions', []))}):")
-            for version in pkg.get('versions', []):
-                print(f"  - {version.get('version', 'Unknown')}")
-                print(f"    Added: {version.get('added_date', 'Unknown')}")
-            sys.exit(0)
-            
-        elif args.command == 'validate-package':
-            is_valid, _ = updater.validate_package(args.repository_name, Path(args.package_dir))
-            if not is_valid:
-                print(f"Package validation failed: {args.package_dir}")
-                sys.exit(1)
-            sys.exit(0)
-    
+        exit_code = _HANDLERS[args.command](updater, args)
     except Exception as e:
         logging.error(f"Command failed: {e}")
         sys.exit(1)
+    
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
@@ -1,13 +1,116 @@
 #!/usr/bin/env python3
 import os
+import sys
 import json
 import logging
 import datetime
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 
+from packaging.version import Version, InvalidVersion
+
 from .registry_diff import RegistryDiff
 
+# orjson is optional; the standard library is the fallback. On PyPy the JIT-compiled
+# standard library codec is used even if orjson happens to be importable.
+if sys.implementation.name == "pypy":
+    orjson = None
+else:
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+
+def _loads(payload: bytes) -> Any:
+    """
+    Parse a JSON document read from disk, using orjson when it is installed.
+    
+    Args:
+        payload: Raw file contents
+        
+    Returns:
+        Decoded JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+# Encoders for when orjson is unavailable, configured to produce the same documents
+# as orjson: two-space indent or compact separators, and non-ASCII characters written
+# as UTF-8. The registry is plain nested dicts and lists, so the circular reference
+# check is unnecessary.
+_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False, check_circular=False)
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, check_circular=False)
+
+_datetime_now = datetime.datetime.now
+
+
+def _now_iso() -> str:
+    """
+    Get the current local time as an ISO 8601 string.
+    
+    Returns:
+        str: ISO formatted timestamp
+    """
+    return _datetime_now().isoformat()
+
+
+def _release_uri(repo_name: str, package_name: str, version: str) -> str:
+    """
+    Build the download URL of a package release archive.
+    
+    Args:
+        repo_name: Repository name
+        package_name: Package name
+        version: Version string
+        
+    Returns:
+        str: URL of the release zip on GitHub
+    """
+    tag = f"{package_name}-v{version}"
+    return f"https://github.com/CrackingShells/{repo_name}/releases/download/{tag}/{tag}.zip"
+
+
+def _version_key(version: str) -> tuple:
+    """
+    Build a sort key ordering version strings by release precedence.
+    
+    Strings that are not valid versions sort below every valid one, and among
+    themselves lexically, rather than failing the whole comparison.
+    
+    Args:
+        version: Version string
+        
+    Returns:
+        tuple: Sort key for the version
+    """
+    try:
+        return (1, Version(version))
+    except InvalidVersion:
+        return (0, version)
+
+
+def _dumps(data: dict, pretty: bool = True) -> bytes:
+    """
+    Serialize registry data to JSON bytes.
+    
+    Pretty output is indented with two spaces, which keeps diffs of the
+    registry file readable where it is committed to git.
+    
+    Args:
+        data: Registry data to serialize
+        pretty: Whether to indent the output rather than write it compactly
+        
+    Returns:
+        bytes: Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2) if pretty else orjson.dumps(data)
+    return (_ENCODER if pretty else _COMPACT_ENCODER).encode(data).encode("utf-8")
+
 class RegistryCoreError(Exception):
     """Base exception for registry core operations."""
     pass
@@ -15,16 +118,147 @@ class RegistryCoreError(Exception):
 class RegistryCore:
     """Core registry operations and data management."""
     
-    def __init__(self, registry_path: Path):
+    def __init__(self, registry_path: Path, pretty: bool = True):
         """
         Initialize the registry core.
         
         Args:
             registry_path: Path to the registry JSON file
+            pretty: Whether to save the registry indented. Compact output is faster to
+                write and smaller, for registries that are not reviewed as text.
         """
         self.logger = logging.getLogger("hatch.registry.core")
         self.registry_path = registry_path
+        self.pretty = pretty
+        
+        # Timestamp shared by every mutation of the current batch, if one is open
+        self._now_cache: Optional[str] = None
+        
         self.registry_data = self._load_registry()
+        self.reindex()
+        
+        # Batching state: while a batch is open, mutations only mark the registry dirty
+        self._batch_depth = 0
+        self._dirty = False
+    
+    def reindex(self) -> None:
+        """
+        Index repositories, packages and versions by name, so that lookups do not scan lists.
+        
+        The indexes hold references to the same dictionaries as self.registry_data, which
+        remains the data that gets saved; every mutating method keeps them in sync. Call
+        this after replacing or editing self.registry_data directly.
+        Missing "repositories", "packages" and "versions" lists are created on the way,
+        so other methods can index them directly.
+        """
+        repositories = self.registry_data.setdefault("repositories", [])
+        for repo in repositories:
+            for pkg in repo.setdefault("packages", []):
+                pkg.setdefault("versions", [])
+        
+        # Built back to front so that, for duplicated names, the first entry wins
+        self._repositories_by_name = {repo.get("name"): repo for repo in reversed(repositories)}
+        self._packages_by_name = {
+            (repo.get("name"), pkg.get("name")): pkg
+            for repo in reversed(repositories)
+            for pkg in reversed(repo["packages"])
+        }
+        self._versions_by_name = {
+            (repo.get("name"), pkg.get("name"), ver.get("version")): ver
+            for repo in reversed(repositories)
+            for pkg in reversed(repo["packages"])
+            for ver in reversed(pkg["versions"])
+        }
+        
+        # Diff calculator, whose cache of reconstructed versions is derived from the
+        # version entries, so it is cleared whenever an existing entry changes or goes
+        self._diff = RegistryDiff(self.registry_data)
+    
+    def _index_package(self, repo_name: str, pkg: dict) -> None:
+        """
+        Add a package and its versions to the lookup indexes.
+        
+        Args:
+            repo_name: Name of the repository holding the package
+            pkg: Package data
+        """
+        package_name = pkg.get("name")
+        self._packages_by_name.setdefault((repo_name, package_name), pkg)
+        for ver in pkg["versions"]:
+            self._versions_by_name.setdefault((repo_name, package_name, ver.get("version")), ver)
+    
+    def _unindex_package(self, repo_name: str, pkg: dict) -> None:
+        """
+        Drop a package and its versions from the lookup indexes.
+        
+        Args:
+            repo_name: Name of the repository holding the package
+            pkg: Package data
+        """
+        package_name = pkg.get("name")
+        self._packages_by_name.pop((repo_name, package_name), None)
+        for ver in pkg["versions"]:
+            self._versions_by_name.pop((repo_name, package_name, ver.get("version")), None)
+    
+    @staticmethod
+    def _remove_entry(entries: list, entry: dict) -> None:
+        """
+        Remove an entry from a list in place, matching by identity.
+        
+        Args:
+            entries: List holding the entry
+            entry: The exact dictionary to remove
+        """
+        for i, candidate in enumerate(entries):
+            if candidate is entry:
+                del entries[i]
+                return
+    
+    @staticmethod
+    def _count_artifacts(versions: List[dict]) -> int:
+        """
+        Count the artifacts recorded on a list of version entries.
+        
+        Args:
+            versions: Version entries of a package
+            
+        Returns:
+            int: Total number of artifacts
+        """
+        return sum(len(ver.get("artifacts", ())) for ver in versions)
+    
+    def _apply_stats_delta(self, packages: int = 0, versions: int = 0, artifacts: int = 0) -> None:
+        """
+        Adjust the registry stats by the given deltas.
+        
+        Args:
+            packages: Change in the number of packages
+            versions: Change in the number of versions
+            artifacts: Change in the number of artifacts
+        """
+        stats = self.registry_data["stats"]
+        stats["total_packages"] = stats.get("total_packages", 0) + packages
+        stats["total_versions"] = stats.get("total_versions", 0) + versions
+        stats["total_artifacts"] = stats.get("total_artifacts", 0) + artifacts
+    
+    def recompute_stats(self) -> dict:
+        """
+        Rebuild the registry stats with a full scan of all repositories.
+        
+        The add and remove methods keep the stats up to date incrementally; this
+        is only needed to repair counters in a registry edited by other means.
+        
+        Returns:
+            dict: The recomputed stats
+        """
+        packages = [pkg for repo in self.registry_data["repositories"] for pkg in repo["packages"]]
+        self.registry_data["stats"] = {
+            "total_packages": len(packages),
+            "total_versions": sum(len(pkg["versions"]) for pkg in packages),
+            "total_artifacts": sum(self._count_artifacts(pkg["versions"]) for pkg in packages),
+        }
+        self._save_registry()
+        return self.registry_data["stats"]
     
     def _load_registry(self) -> dict:
         """
@@ -34,11 +268,11 @@ class RegistryCore:
             dict: Registry data
         """
         if not self.registry_path.exists():
-            self.logger.info(f"Registry file not found, creating new: {self.registry_path}")
+            self.logger.info("Registry file not found, creating new: %s", self.registry_path)
             # Create a new empty registry
             registry_data = {
                 "registry_schema_version": "1.0.0",
-                "last_updated": datetime.datetime.now().isoformat(),
+                "last_updated": self._now(),
                 "repositories": [],
                 "stats": {
                     "total_packages": 0,
@@ -50,8 +284,7 @@ class RegistryCore:
             # Save the new registry file
             try:
                 os.makedirs(self.registry_path.parent, exist_ok=True)
-                with open(self.registry_path, 'w') as f:
-                    json.dump(registry_data, f, indent=2)
+                self._write_registry_file(_dumps(registry_data, self.pretty))
                 return registry_data
             except Exception as e:
                 msg = f"Failed to create registry file: {e}"
@@ -59,8 +292,8 @@ class RegistryCore:
                 raise RegistryCoreError(msg) from e
                 
         try:
-            with open(self.registry_path, 'r') as f:
-                registry_data = json.load(f)
+            with open(self.registry_path, 'rb') as f:
+                registry_data = _loads(f.read())
                 
             # Ensure stats field exists
             if "stats" not in registry_data:
@@ -77,31 +310,100 @@ class RegistryCore:
             self.logger.error(msg)
             raise RegistryCoreError(msg) from e
     
+    def _write_registry_file(self, payload: bytes) -> None:
+        """
+        Atomically replace the registry file with the given payload.
+        
+        The payload is written to a sibling temporary file, flushed to disk and
+        then renamed over the registry, so readers never see a partial file. The
+        temporary file is removed if any step fails.
+        
+        Args:
+            payload: Encoded registry document
+        """
+        tmp_path = self.registry_path.with_suffix(self.registry_path.suffix + '.tmp')
+        try:
+            with open(tmp_path, 'wb', buffering=1024 * 1024) as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.registry_path)
+        except BaseException:
+            # Do not leave a partial temporary file next to the registry
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    
     def _save_registry(self, data: dict = None) -> bool:
         """
         Save registry data to file.
         
+        While a batch is open, saving self.registry_data only marks it dirty; the
+        file is written once when the outermost batch exits.
+        
         Args:
             data: Registry data to save. If None, uses self.registry_data
             
         Returns:
-            bool: True if successful
+            bool: True if successful or deferred to the end of the batch
         """
         if data is None:
             data = self.registry_data
             
+        if data is self.registry_data and self._batch_depth:
+            self._dirty = True
+            return True
+            
         # Update the timestamp
-        data["last_updated"] = datetime.datetime.now().isoformat()
+        data["last_updated"] = self._now()
         
         try:
-            with open(self.registry_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            self._write_registry_file(_dumps(data, self.pretty))
+            if data is self.registry_data:
+                self._dirty = False
             return True
                 
         except Exception as e:
-            self.logger.error(f"Failed to save registry file: {e}")
+            self.logger.error("Failed to save registry file: %s", e)
             return False
     
+    def _now(self) -> str:
+        """
+        Get the timestamp to record for a mutation.
+        
+        Returns:
+            str: ISO formatted time, shared by all mutations of an open batch
+        """
+        return self._now_cache or _now_iso()
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group several registry mutations into a single save.
+        
+        Inside the block, mutating methods only update the in-memory registry; the file
+        is written once when the outermost batch exits, and only if something changed.
+        Batches may be nested.
+        
+        Example:
+            with core.batch():
+                core.add_repository("repo-a", url_a)
+                core.add_repository("repo-b", url_b)
+        """
+        if not self._batch_depth:
+            self._now_cache = _now_iso()
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                if self._dirty:
+                    self._save_registry()
+                self._now_cache = None
+    
     def add_repository(self, name: str, url: str) -> bool:
         """
         Add a new repository to the registry.
@@ -114,25 +416,47 @@ class RegistryCore:
             bool: True if the repository was added, False if it already exists
         """
         # Check if repository already exists
-        for repo in self.registry_data.get("repositories", []):
-            if repo.get("name") == name:
-                self.logger.warning(f"Repository {name} already exists")
-                return False
+        if name in self._repositories_by_name:
+            self.logger.warning("Repository %s already exists", name)
+            return False
         
         # Add the repository
         repository = {
             "name": name,
             "url": url,
             "packages": [],
-            "last_indexed": datetime.datetime.now().isoformat()
+            "last_indexed": self._now()
         }
         
-        self.registry_data.setdefault("repositories", []).append(repository)
+        self.registry_data["repositories"].append(repository)
+        self._repositories_by_name[name] = repository
         self._save_registry()
         
-        self.logger.info(f"Added repository {name} to registry")
+        self.logger.info("Added repository %s to registry", name)
         return True
     
+    def _locate(self, repo_name: str, package_name: Optional[str] = None,
+                version: Optional[str] = None) -> Tuple[Optional[dict], Optional[dict], Optional[dict]]:
+        """
+        Look up a repository and, optionally, one of its packages and versions at once.
+        
+        Args:
+            repo_name: Repository name
+            package_name: Package name, or None to only look up the repository
+            version: Version string, or None to skip the version lookup
+            
+        Returns:
+            Tuple[Optional[dict], Optional[dict], Optional[dict]]: (repository, package, version)
+            data, each None if not found or not requested
+        """
+        repo = self._repositories_by_name.get(repo_name)
+        pkg = ver = None
+        if repo is not None and package_name is not None:
+            pkg = self._packages_by_name.get((repo_name, package_name))
+            if pkg is not None and version is not None:
+                ver = self._versions_by_name.get((repo_name, package_name, version))
+        return repo, pkg, ver
+    
     def find_repository(self, repo_name: str) -> Optional[dict]:
         """
         Find a repository in the registry by name.
@@ -143,12 +467,11 @@ class RegistryCore:
         Returns:
             dict: Repository data or None if not found
         """
-        self.logger.debug(f"Searching for repository {repo_name}")
-        for repo in self.registry_data.get("repositories", []):
-            if repo.get("name") == repo_name:
-                return repo
-        self.logger.debug(f"Repository {repo_name} not found")
-        return None
+        self.logger.debug("Searching for repository %s", repo_name)
+        repo = self._repositories_by_name.get(repo_name)
+        if repo is None:
+            self.logger.debug("Repository %s not found", repo_name)
+        return repo
     
     def update_repository_timestamp(self, repo_name: str) -> bool:
         """
@@ -162,7 +485,7 @@ class RegistryCore:
         """
         repo = self.find_repository(repo_name)
         if repo:
-            repo["last_indexed"] = datetime.datetime.now().isoformat()
+            repo["last_indexed"] = self._now()
             self._save_registry()
             return True
         return False
@@ -177,19 +500,21 @@ class RegistryCore:
         Returns:
             bool: True if successful, False if repository not found
         """
-        initial_count = len(self.registry_data.get("repositories", []))
-        self.registry_data["repositories"] = [
-            repo for repo in self.registry_data.get("repositories", [])
-            if repo.get("name") != repo_name
-        ]
-        
-        if len(self.registry_data.get("repositories", [])) < initial_count:
-            self._save_registry()
-            self.logger.info(f"Removed repository {repo_name} from registry")
-            return True
+        repo = self._repositories_by_name.pop(repo_name, None)
+        if repo is None:
+            self.logger.warning("Repository %s not found, nothing removed", repo_name)
+            return False
             
-        self.logger.warning(f"Repository {repo_name} not found, nothing removed")
-        return False
+        self._remove_entry(self.registry_data["repositories"], repo)
+        for pkg in repo["packages"]:
+            self._unindex_package(repo_name, pkg)
+            self._apply_stats_delta(packages=-1, versions=-len(pkg["versions"]),
+                                    artifacts=-self._count_artifacts(pkg["versions"]))
+        self._diff.clear_cache()
+            
+        self._save_registry()
+        self.logger.info("Removed repository %s from registry", repo_name)
+        return True
     
     def find_package(self, repo_name: str, package_name: str) -> Optional[dict]:
         """
@@ -202,14 +527,11 @@ class RegistryCore:
         Returns:
             dict: Package data or None if not found
         """
-        self.logger.debug(f"Searching for package {package_name} in repository {repo_name}")
-        repo = self.find_repository(repo_name)
-        if repo:
-            for pkg in repo.get("packages", []):
-                if pkg.get("name") == package_name:
-                    return pkg
-        self.logger.debug(f"Package {package_name} not found in repository {repo_name}")
-        return None
+        self.logger.debug("Searching for package %s in repository %s", package_name, repo_name)
+        pkg = self._packages_by_name.get((repo_name, package_name))
+        if pkg is None:
+            self.logger.debug("Package %s not found in repository %s", package_name, repo_name)
+        return pkg
     
     def find_version(self, repo_name: str, package_name: str, version: str) -> Optional[dict]:
         """
@@ -223,14 +545,11 @@ class RegistryCore:
         Returns:
             dict: Version data or None if not found
         """
-        self.logger.debug(f"Searching for version {version} for package {package_name} in repository {repo_name}")
-        pkg = self.find_package(repo_name, package_name)
-        if pkg:
-            for ver in pkg.get("versions", []):
-                if ver.get("version") == version:
-                    return ver
-        self.logger.debug(f"Version {version} not found for package {package_name} in repository {repo_name}")
-        return None
+        self.logger.debug("Searching for version %s for package %s in repository %s", version, package_name, repo_name)
+        ver = self._versions_by_name.get((repo_name, package_name, version))
+        if ver is None:
+            self.logger.debug("Version %s not found for package %s in repository %s", version, package_name, repo_name)
+        return ver
     
     def remove_package(self, repo_name: str, package_name: str) -> bool:
         """
@@ -243,24 +562,24 @@ class RegistryCore:
         Returns:
             bool: True if successful, False if package or repository not found
         """
-        repo = self.find_repository(repo_name)
+        repo, pkg, _ = self._locate(repo_name, package_name)
         if not repo:
-            self.logger.warning(f"Repository {repo_name} not found, cannot remove package")
+            self.logger.warning("Repository %s not found, cannot remove package", repo_name)
             return False
             
-        initial_count = len(repo.get("packages", []))
-        repo["packages"] = [
-            pkg for pkg in repo.get("packages", []) 
-            if pkg.get("name") != package_name
-        ]
-        
-        if len(repo.get("packages", [])) < initial_count:
-            self._save_registry()
-            self.logger.info(f"Removed package {package_name} from repository {repo_name}")
-            return True
+        if pkg is None:
+            self.logger.warning("Package %s not found in repository %s", package_name, repo_name)
+            return False
             
-        self.logger.warning(f"Package {package_name} not found in repository {repo_name}")
-        return False
+        self._remove_entry(repo["packages"], pkg)
+        self._unindex_package(repo_name, pkg)
+        self._diff.clear_cache()
+        self._apply_stats_delta(packages=-1, versions=-len(pkg["versions"]),
+                                artifacts=-self._count_artifacts(pkg["versions"]))
+        
+        self._save_registry()
+        self.logger.info("Removed package %s from repository %s", package_name, repo_name)
+        return True
     
     def remove_version(self, repo_name: str, package_name: str, version: str) -> bool:
         """
@@ -274,37 +593,36 @@ class RegistryCore:
         Returns:
             bool: True if successful, False if not found
         """
-        pkg = self.find_package(repo_name, package_name)
+        _, pkg, ver = self._locate(repo_name, package_name, version)
         if not pkg:
-            self.logger.warning(f"Package {package_name} not found in repository {repo_name}")
+            self.logger.warning("Package %s not found in repository %s", package_name, repo_name)
             return False
             
-        initial_count = len(pkg.get("versions", []))
-        pkg["versions"] = [
-            ver for ver in pkg.get("versions", [])
-            if ver.get("version") != version
-        ]
-        
-        if len(pkg.get("versions", [])) < initial_count:
-            # Update latest version if needed
-            if pkg.get("latest_version") == version:
-                # Find new latest version based on date added
-                if pkg.get("versions"):
-                    latest = max(pkg.get("versions", []), 
-                               key=lambda v: v.get("added_date", ""))
-                    pkg["latest_version"] = latest.get("version")
-                else:
-                    pkg["latest_version"] = ""
-                    
-            # Update stats
-            self.registry_data["stats"]["total_versions"] -= 1
-                
-            self._save_registry()
-            self.logger.info(f"Removed version {version} from package {package_name}")
-            return True
+        if ver is None:
+            self.logger.warning("Version %s not found in package %s", version, package_name)
+            return False
             
-        self.logger.warning(f"Version {version} not found in package {package_name}")
-        return False
+        del self._versions_by_name[(repo_name, package_name, version)]
+        self._diff.clear_cache()
+        versions = pkg["versions"]
+        self._remove_entry(versions, ver)
+        
+        # Update latest version if needed
+        if pkg.get("latest_version") == version:
+            # Find new latest version by version precedence
+            if versions:
+                latest = max(versions,
+                             key=lambda v: _version_key(v.get("version", "")))
+                pkg["latest_version"] = latest.get("version")
+            else:
+                pkg["latest_version"] = ""
+                
+        # Update stats
+        self._apply_stats_delta(versions=-1, artifacts=-self._count_artifacts([ver]))
+        
+        self._save_registry()
+        self.logger.info("Removed version %s from package %s", version, package_name)
+        return True
     
     def add_package(self, repo_name: str, package_metadata: Dict[str, Any],
                     author: Optional[Dict[str, str]] = None,
@@ -324,7 +642,7 @@ class RegistryCore:
         # Check if repository exists
         repo = self.find_repository(repo_name)
         if not repo:
-            self.logger.error(f"Repository {repo_name} not found")
+            self.logger.error("Repository %s not found", repo_name)
             return False
             
         # Check if package already exists
@@ -334,7 +652,7 @@ class RegistryCore:
             return False
             
         if self.find_package(repo_name, package_name):
-            self.logger.warning(f"Package {package_name} already exists in repository {repo_name}")
+            self.logger.warning("Package %s already exists in repository %s", package_name, repo_name)
             return False
         
         # Ensure author is provided
@@ -344,6 +662,8 @@ class RegistryCore:
                 "email": package_metadata.get("author").get("email"),
             }
 
+        version = package_metadata["version"]
+        
         # Create package entry
         package = {
             "name": package_name,
@@ -352,27 +672,28 @@ class RegistryCore:
             "versions": [
                 {
                     "author": author,
-                    "release_uri": f"https://github.com/CrackingShells/{repo_name}/releases/download/{package_name}-v{package_metadata['version']}/{package_name}-v{package_metadata['version']}.zip",
-                    "version": package_metadata["version"],
-                    "added_date": datetime.datetime.now().isoformat(),
+                    "release_uri": _release_uri(repo_name, package_name, version),
+                    "version": version,
+                    "added_date": self._now(),
                     "hatch_dependencies_added": package_metadata.get("hatch_dependencies", []),
                     "python_dependencies_added": package_metadata.get("python_dependencies", []),
                     "compatibility_changes": package_metadata.get("compatibility", {}),
                 }
             ],
-            "latest_version": package_metadata["version"],
+            "latest_version": version,
         }
         
         # Add package to repository
         repo["packages"].append(package)
+        self._index_package(repo_name, package)
         
         # Update stats
-        self.registry_data["stats"]["total_packages"] += 1
-        self.registry_data["stats"]["total_versions"] += 1
+        self._apply_stats_delta(packages=1, versions=1,
+                                artifacts=self._count_artifacts(package["versions"]))
         
         # Save registry
         self._save_registry()
-        self.logger.info(f"Added package {package_name} to repository {repo_name}")
+        self.logger.info("Added package %s to repository %s", package_name, repo_name)
         return True
     
     def update_package_metadata(self, repo_name: str, package_name: str, metadata_updates: Dict[str, Any]) -> bool:
@@ -385,12 +706,15 @@ class RegistryCore:
             metadata_updates: Dictionary containing metadata fields to update
             
         Returns:
-            bool: True if the package was updated successfully
+            bool: True if the package was updated, False if it was not found or nothing changed
         """
+        if not metadata_updates:
+            return False
+            
         # Find the package
         pkg = self.find_package(repo_name, package_name)
         if not pkg:
-            self.logger.error(f"Package {package_name} not found in repository {repo_name}")
+            self.logger.error("Package %s not found in repository %s", package_name, repo_name)
             return False
             
         # Update allowed fields
@@ -398,13 +722,13 @@ class RegistryCore:
         updated = False
         
         for field in allowed_fields:
-            if field in metadata_updates:
+            if field in metadata_updates and pkg.get(field) != metadata_updates[field]:
                 pkg[field] = metadata_updates[field]
                 updated = True
                 
         if updated:
             self._save_registry()
-            self.logger.info(f"Updated metadata for package {package_name} in repository {repo_name}")
+            self.logger.info("Updated metadata for package %s in repository %s", package_name, repo_name)
             
         return updated
     
@@ -419,12 +743,15 @@ class RegistryCore:
             updates: Dictionary containing fields to update
             
         Returns:
-            bool: True if the version was updated successfully
+            bool: True if the version was updated, False if it was not found or nothing changed
         """
+        if not updates:
+            return False
+            
         # Find the version
         ver_data = self.find_version(repo_name, package_name, version)
         if not ver_data:
-            self.logger.error(f"Version {version} not found for package {package_name} in repository {repo_name}")
+            self.logger.error("Version %s not found for package %s in repository %s", version, package_name, repo_name)
             return False
             
         # Update allowed fields - note: don't allow changing the version string itself
@@ -432,13 +759,14 @@ class RegistryCore:
         updated = False
         
         for field, value in updates.items():
-            if field not in restricted_fields:
+            if field not in restricted_fields and ver_data.get(field) != value:
                 ver_data[field] = value
                 updated = True
                 
         if updated:
+            self._diff.clear_cache()
             self._save_registry()
-            self.logger.info(f"Updated data for version {version} of package {package_name}")
+            self.logger.info("Updated data for version %s of package %s", version, package_name)
             
         return updated
     
@@ -453,95 +781,45 @@ class RegistryCore:
         Returns:
             dict: Metadata or empty dict if not found
         """
+        metadata_file_path = os.path.join(package_path, metadata_path)
         try:
-            metadata_file_path = package_path / metadata_path
-            if not metadata_file_path.exists():
-                self.logger.error(f"Metadata file not found: {metadata_file_path}")
-                return {}
-                
-            with open(metadata_file_path, 'r') as f:
-                metadata = json.load(f)
-                return metadata
+            with open(metadata_file_path, 'rb') as f:
+                return _loads(f.read())
                 
+        except FileNotFoundError:
+            self.logger.error("Metadata file not found: %s", metadata_file_path)
+            return {}
         except Exception as e:
-            self.logger.error(f"Failed to load metadata: {e}")
+            self.logger.error("Failed to load metadata: %s", e)
             return {}
     
 
-    def _prepare_registry_version_diff_data(self, repo_name: str, package_metadata: dict) -> Dict[str, Any]:
+    def _prepare_registry_version_diff_data(self, repo_name: str, pkg: dict, package_metadata: dict) -> Dict[str, Any]:
         """
         Prepare version data for storage in the registry.
         
         Args:
             repo_name: Repository name
+            pkg: Registry entry of the package the new version belongs to
             package_metadata: Package metadata
             
         Returns:
             Dictionary containing version data
         """
 
-        # Get dependencies from the package metadata
-        hatch_dependencies = package_metadata.get("hatch_dependencies", [])
-        python_dependencies = package_metadata.get("python_dependencies", [])
-        compatibility = package_metadata.get("compatibility", {})
-
-        # Initialize dependency and compatibility changes
-        hatch_dependencies_added, hatch_dependencies_removed, hatch_dependencies_modified = [], [], []
-        python_dependencies_added, python_dependencies_removed, python_dependencies_modified = [], [], []
-        compatibility_changes = {}
-            
-        # Get the latest version info
-        pkg = self.find_package(repo_name, package_metadata['name'])
-        
         # Add the base version reference
         diff_data = {
             "base_version": pkg["latest_version"]
         }
 
         # Get the diff info from the latest package version
-        latest_pkg_diff_info = pkg["versions"][-1]
-
-        # Work on the diff data
-        reg_diff = RegistryDiff(self.registry_data)
+        latest_pkg_diff_info = self.find_version(repo_name, pkg["name"], pkg["latest_version"])
 
         # Reconstruct the dependencies and compatibility from the latest version
-        latest_pkg_all_info = reg_diff.reconstruct_package_version(pkg, latest_pkg_diff_info)
+        latest_pkg_all_info = self._diff.reconstruct_package_version(pkg, latest_pkg_diff_info)
                 
-        # Compute diffs for dependencies
-        hatch_dependencies_added, hatch_dependencies_removed, hatch_dependencies_modified = reg_diff.compute_dependency_diff(
-            latest_pkg_all_info["hatch_dependencies"],
-            hatch_dependencies
-        )
-        
-        # Compute diffs for Python dependencies
-        python_dependencies_added, python_dependencies_removed, python_dependencies_modified = reg_diff.compute_python_dependency_diff(
-            latest_pkg_all_info["python_dependencies"],
-            python_dependencies
-        )
-
-        # Compute diffs for compatibility
-        compatibility_changes = reg_diff.compute_compatibility_diff(
-            latest_pkg_all_info["compatibility"],
-            compatibility
-        )
-        
         # Add differential data - using "hatch_dependencies" key to match package_validator.py
-        if hatch_dependencies_added:
-            diff_data["hatch_dependencies_added"] = hatch_dependencies_added
-        if hatch_dependencies_removed:
-            diff_data["hatch_dependencies_removed"] = hatch_dependencies_removed
-        if hatch_dependencies_modified:
-            diff_data["hatch_dependencies_modified"] = hatch_dependencies_modified
-
-        if python_dependencies_added:
-            diff_data["python_dependencies_added"] = python_dependencies_added
-        if python_dependencies_removed:
-            diff_data["python_dependencies_removed"] = python_dependencies_removed
-        if python_dependencies_modified:
-            diff_data["python_dependencies_modified"] = python_dependencies_modified
-            
-        if compatibility_changes:
-            diff_data["compatibility_changes"] = compatibility_changes
+        diff_data.update(self._diff.compute_all_diffs(latest_pkg_all_info, package_metadata))
         
         return diff_data
 
@@ -559,15 +837,23 @@ class RegistryCore:
         Returns:
             bool: True if successful
         """
+        package_name = package_metadata['name']
+        version = package_metadata['version']
+        repo, pkg, existing_version = self._locate(repo_name, package_name, version)
+        
         # Check if repository exists
-        repo = self.find_repository(repo_name)
         if not repo:
-            self.logger.error(f"Repository {repo_name} not found")
+            self.logger.error("Repository %s not found", repo_name)
+            return False
+
+        # New versions can only be added to existing packages
+        if not pkg:
+            self.logger.error("Package %s not found in repository %s", package_name, repo_name)
             return False
 
         # Check if the version already exists (basic validation)
-        if self.find_version(repo_name, package_metadata['name'], package_metadata['version']):
-            self.logger.error(f"Version {package_metadata['version']} of package {package_metadata['name']} already exists")
+        if existing_version:
+            self.logger.error("Version %s of package %s already exists", version, package_name)
             return False
         
         # Ensure author is provided
@@ -579,28 +865,27 @@ class RegistryCore:
         
         version_data = {
             "author": author,
-            "release_uri": f"https://github.com/CrackingShells/{repo_name}/releases/download/{package_metadata['name']}-v{package_metadata['version']}/{package_metadata['name']}-v{package_metadata['version']}.zip",
-            "version": package_metadata['version'],
-            "added_date": datetime.datetime.now().isoformat()
+            "release_uri": _release_uri(repo_name, package_name, version),
+            "version": version,
+            "added_date": self._now()
         }
 
         # Compute dependency diffs
-        registry_version_diff_data = self._prepare_registry_version_diff_data(repo_name, package_metadata)
+        registry_version_diff_data = self._prepare_registry_version_diff_data(repo_name, pkg, package_metadata)
 
-        self.logger.debug(f"Version data prepared for {package_metadata['name']}: {registry_version_diff_data}")
+        self.logger.debug("Version data prepared for %s: %s", package_name, registry_version_diff_data)
 
         version_data.update(registry_version_diff_data)
         
         # Add new version to package
-        pkg = self.find_package(repo_name, package_metadata['name'])
         pkg["versions"].append(version_data) # this will propagate back to self.registry_data by reference
-        pkg["latest_version"] = package_metadata['version']
+        if _version_key(version) > _version_key(pkg["latest_version"]):
+            pkg["latest_version"] = version
+        self._versions_by_name[(repo_name, package_name, version)] = version_data
             
         # Update stats
-        self.registry_data["stats"]["total_versions"] += 1
+        self._apply_stats_delta(versions=1, artifacts=self._count_artifacts([version_data]))
         
-        self.logger.debug(f"Current registry is: {json.dumps(self.registry_data, indent=2)}")
-
         # Save registry
         self._save_registry()
 
@@ -1,10 +1,7 @@
 #!/usr/bin/env python3
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, Callable, List, Tuple, Optional, Union
 import logging
 
-# Import Hatch modules
-from hatch_validator import DependencyResolver
-
 class RegistryDiffError(Exception):
     """Exception for differential storage operations."""
     pass
@@ -12,15 +9,55 @@ class RegistryDiffError(Exception):
 class RegistryDiff:
     """Handles differential storage calculations for registry versions."""
     
-    def __init__(self, registry_data: dict = None):
+    def __init__(self, registry_data: Union[dict, Callable[[], dict]] = None):
         """
         Initialize the registry diff calculator.
         
         Args:
-            registry_data: Optional registry data for dependency resolution
+            registry_data: Optional registry data for dependency resolution, or a callable
+                returning it so that the current registry is read even if it is rebound
         """
         self.logger = logging.getLogger("hatch.registry.diff")
-        self.registry_data = registry_data
+        self._registry_source = registry_data
+        
+        # Reconstructed versions keyed by (id(package), version), stored along with the
+        # package itself so that a recycled id never matches a different package
+        self._reconstructions: Dict[Tuple[int, str], Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+    
+    @property
+    def registry_data(self) -> Optional[dict]:
+        """Registry data, read through the callable if one was given."""
+        source = self._registry_source
+        return source() if callable(source) else source
+    
+    @registry_data.setter
+    def registry_data(self, registry_data: Union[dict, Callable[[], dict]]) -> None:
+        self._registry_source = registry_data
+    
+    def clear_cache(self) -> None:
+        """
+        Forget all reconstructed versions.
+        
+        Call this whenever existing version entries are modified or removed, since
+        cached reconstructions are derived from them.
+        """
+        self._reconstructions.clear()
+    
+    def _cached_reconstruction(self, package: Dict[str, Any], version: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a previously reconstructed version of a package, if any.
+        
+        Args:
+            package: Package object from the registry
+            version: Version string
+            
+        Returns:
+            Optional[Dict[str, Any]]: The cached reconstruction or None
+        """
+        entry = self._reconstructions.get((id(package), version))
+        if entry is not None and entry[0] is package:
+            return entry[1]
+        return None
     
     def _compute_generic_diff(self, old_items: List[Dict[str, Any]], 
                              new_items: List[Dict[str, Any]],
@@ -41,29 +78,29 @@ class RegistryDiff:
         if diff_fields is None:
             diff_fields = []
             
+        # With one side empty, everything on the other side was added or removed
+        if not old_items:
+            return list({item[key_field]: item for item in new_items}.values()), [], []
+        if not new_items:
+            return [], list(dict.fromkeys(item[key_field] for item in old_items)), []
+            
         # Create dictionaries for comparison
         old_dict = {item[key_field]: item for item in old_items}
         new_dict = {item[key_field]: item for item in new_items}
         
-        # Find added items
-        added_keys = set(new_dict.keys()) - set(old_dict.keys())
-        added = [new_dict[key] for key in added_keys]
-        
-        # Find removed items
-        removed_keys = set(old_dict.keys()) - set(new_dict.keys())
-        removed = list(removed_keys)
-        
-        # Find modified items
-        modified = []
-        for key in set(old_dict.keys()) & set(new_dict.keys()):
-            old_item = old_dict[key]
-            new_item = new_dict[key]
-            
-            # Check if any of the diff fields changed
+        # Classify new items with one probe of the old items each, then find the
+        # removed ones; results keep the order of the input lists
+        added, modified = [], []
+        for key, item in new_dict.items():
+            old_item = old_dict.get(key)
+            if old_item is None:
+                added.append(item)
+                continue
             for field in diff_fields:
-                if old_item.get(field) != new_item.get(field):
-                    modified.append(new_item)
+                if old_item.get(field) != item.get(field):
+                    modified.append(item)
                     break
+        removed = [key for key in old_dict if key not in new_dict]
                 
         return added, removed, modified
     
@@ -112,21 +149,68 @@ class RegistryDiff:
         Returns:
             Dict[str, str]: Dictionary of changed compatibility constraints
         """
+        if not old_compat and not new_compat:
+            return {}
+            
         changes = {}
         
-        for key in ["hatchling", "python"]:
-            old_val = old_compat.get(key, "")
-            new_val = new_compat.get(key, "")
+        # The two supported constraints, compared directly rather than in a loop
+        new_val = new_compat.get("hatchling", "")
+        if old_compat.get("hatchling", "") != new_val:
+            changes["hatchling"] = new_val
             
-            if old_val != new_val:
-                changes[key] = new_val
+        new_val = new_compat.get("python", "")
+        if old_compat.get("python", "") != new_val:
+            changes["python"] = new_val
                 
         return changes
 
+    def compute_all_diffs(self, base_metadata: Dict[str, Any], new_metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compute every dependency and compatibility difference between two package versions.
+        
+        Args:
+            base_metadata: Complete metadata of the base version, e.g. as returned by
+                reconstruct_package_version
+            new_metadata: Complete metadata of the new version
+            
+        Returns:
+            Dict[str, Any]: The non-empty differential fields to store on the new version:
+            hatch_dependencies_added/removed/modified, python_dependencies_added/removed/modified
+            and compatibility_changes
+        """
+        diffs = {}
+        
+        # Sections that compare equal cannot differ, so releases that only bump the
+        # version skip the per-dependency diffs entirely
+        for prefix, compute in (("hatch_dependencies", self.compute_dependency_diff),
+                                ("python_dependencies", self.compute_python_dependency_diff)):
+            old_deps = base_metadata.get(prefix, [])
+            new_deps = new_metadata.get(prefix, [])
+            if old_deps == new_deps:
+                continue
+            added, removed, modified = compute(old_deps, new_deps)
+            if added:
+                diffs[f"{prefix}_added"] = added
+            if removed:
+                diffs[f"{prefix}_removed"] = removed
+            if modified:
+                diffs[f"{prefix}_modified"] = modified
+        
+        old_compatibility = base_metadata.get("compatibility", {})
+        new_compatibility = new_metadata.get("compatibility", {})
+        if old_compatibility != new_compatibility:
+            compatibility_changes = self.compute_compatibility_diff(old_compatibility, new_compatibility)
+            if compatibility_changes:
+                diffs["compatibility_changes"] = compatibility_changes
+            
+        return diffs
+
     def reconstruct_package_version(self, package: Dict[str, Any], version_info: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Reconstruct complete package metadata for a specific version by walking the diff tree.
-        If version is not specified, uses the latest version.
+        If version is not specified, uses the latest version. Results are cached per package
+        version and reused for later versions built on them; see clear_cache().
         
         Args:
             package: Package object from the registry
@@ -144,84 +228,100 @@ class RegistryDiff:
             self.logger.error(msg)
             raise RegistryDiffError(msg)
         
+        # Versions by name, so each step of the walk is a single lookup
+        versions_by_name = {ver.get("version"): ver for ver in package["versions"]}
+
         # If version not specified, use latest
         if version_info is None:
-            version_info = package["versions"][-1]
+            version_info = versions_by_name.get(package.get("latest_version")) or package["versions"][-1]
 
-        package_versions = package["versions"]
+        cached = self._cached_reconstruction(package, version_info.get("version"))
+        if cached is None:
+            cached = self._reconstruct(package, version_info, versions_by_name)
+            self._reconstructions[(id(package), version_info.get("version"))] = (package, cached)
+            self.logger.debug("Successfully reconstructed metadata for %s v%s", package['name'], version_info['version'])
 
-        version_chain = []
-        while version_info.get("base_version"):
-            version_chain += [version_info]
-            base_version = version_info.get("base_version")
-            # If no base version, we are at the root of the chain
-            # and can stop
-            if not base_version:
-                break
+        # Hand out copies of the containers so callers cannot alter the cached state
+        return {
+            "name": cached["name"],
+            "version": cached["version"],
+            "hatch_dependencies": list(cached["hatch_dependencies"]),
+            "python_dependencies": list(cached["python_dependencies"]),
+            "compatibility": dict(cached["compatibility"])
+        }
 
-            # Find the next version in the chain
-            for ver in package_versions:
-                if ver.get("version") == base_version:
-                    version_info = ver
-                    break
+    def _reconstruct(self, package: Dict[str, Any], version_info: Dict[str, Any],
+                     versions_by_name: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Reconstruct a version by applying the diffs of its chain.
         
-        # Now reconstruct the package metadata
-        reconstructed = {
-            "name": package["name"],
-            "version": version_info["version"],
-            "hatch_dependencies": [],
-            "python_dependencies": [],
-            "compatibility": {}
-        }
+        The walk stops early at the nearest base version that was already reconstructed,
+        and only the diffs above it are applied.
+        
+        Args:
+            package: Package object from the registry
+            version_info: Version information from which to start reconstruction
+            versions_by_name: The package's versions keyed by version string
+            
+        Returns:
+            Dict[str, Any]: Reconstructed package metadata including dependencies and compatibility
+        """
+        # Walk from the requested version back to the root of the chain, which is
+        # the version without a base version, and include the root itself
+        version_chain = [version_info]
+        base_reconstruction = None
+        base_version = version_info.get("base_version")
+        while base_version:
+            base_reconstruction = self._cached_reconstruction(package, base_version)
+            if base_reconstruction is not None:
+                break
+            base_info = versions_by_name.get(base_version)
+            if base_info is None or len(version_chain) > len(versions_by_name):
+                self.logger.warning("Broken version chain for %s at base version %s",
+                                    package["name"], base_version)
+                break
+            version_chain.append(base_info)
+            base_version = base_info.get("base_version")
+        
+        # Accumulate dependencies by name while applying the diffs, so that each
+        # addition, removal and modification is a single dict operation
+        hatch_dependencies = {}
+        python_dependencies = {}
+        compatibility = {}
+        if base_reconstruction is not None:
+            hatch_dependencies = {dep.get("name"): dep for dep in base_reconstruction["hatch_dependencies"]}
+            python_dependencies = {dep.get("name"): dep for dep in base_reconstruction["python_dependencies"]}
+            compatibility = dict(base_reconstruction["compatibility"])
 
         # Apply changes from each version in the chain
-        for ver in reversed(version_chain): # version chain was built from latest to oldest
-            # Process hatch dependencies
+        for ver in reversed(version_chain): # version chain was built from the requested version to the root
             # Apply diffs for Hatch dependencies
-            # Add new dependencies
             for dep in ver.get("hatch_dependencies_added", []):
-                reconstructed["hatch_dependencies"].append(dep)
-
-            # Remove dependencies
+                hatch_dependencies[dep.get("name")] = dep
             for dep_name in ver.get("hatch_dependencies_removed", []):
-                reconstructed["hatch_dependencies"] = [
-                    d for d in reconstructed["hatch_dependencies"] 
-                    if d.get("name") != dep_name
-                ]
-                
-            # Modify dependencies
+                hatch_dependencies.pop(dep_name, None)
             for mod_dep in ver.get("hatch_dependencies_modified", []):
-                for i, dep in enumerate(reconstructed["hatch_dependencies"]):
-                    if dep.get("name") == mod_dep.get("name"):
-                        reconstructed["hatch_dependencies"][i] = mod_dep
-                        break
+                if mod_dep.get("name") in hatch_dependencies:
+                    hatch_dependencies[mod_dep.get("name")] = mod_dep
             
-            # Process Python dependencies
             # Apply diffs for Python dependencies
-            # Add new dependencies
             for dep in ver.get("python_dependencies_added", []):
-                reconstructed["python_dependencies"].append(dep)
-                
-            # Remove dependencies
+                python_dependencies[dep.get("name")] = dep
             for dep_name in ver.get("python_dependencies_removed", []):
-                reconstructed["python_dependencies"] = [
-                    d for d in reconstructed["python_dependencies"] 
-                    if d.get("name") != dep_name
-                ]
-                
-            # Modify dependencies
+                python_dependencies.pop(dep_name, None)
             for mod_dep in ver.get("python_dependencies_modified", []):
-                for i, dep in enumerate(reconstructed["python_dependencies"]):
-                    if dep.get("name") == mod_dep.get("name"):
-                        reconstructed["python_dependencies"][i] = mod_dep
-                        break
+                if mod_dep.get("name") in python_dependencies:
+                    python_dependencies[mod_dep.get("name")] = mod_dep
             
-            # Process compatibility info
             # Update compatibility with changes
-            for key, value in ver.get("compatibility_changes", {}).items():
-                reconstructed["compatibility"][key] = value
+            compatibility.update(ver.get("compatibility_changes", {}))
 
-        self.logger.debug(f"Successfully reconstructed metadata for {package['name']} v{version_info['version']}")
-        return reconstructed
+        return {
+            "name": package["name"],
+            "version": version_info["version"],
+            "hatch_dependencies": list(hatch_dependencies.values()),
+            "python_dependencies": list(python_dependencies.values()),
+            "compatibility": compatibility
+        }
 
 
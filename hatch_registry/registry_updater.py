@@ -1,7 +1,6 @@
-import datetime
 import logging
 from pathlib import Path
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional
 
 # Import internal modules
 from .registry_core import RegistryCore
@@ -28,7 +27,7 @@ class RegistryUpdater:
         """
         self.logger = logging.getLogger("hatch.registry.updater")
         self.core = RegistryCore(registry_path)
-        self.validator = RegistryValidator(self.core.registry_data)
+        self.validator = RegistryValidator(lambda: self.core.registry_data)
     
     def _add_new_package(self, repo_name: str, package_metadata: dict = None,
                          author: Optional[Dict[str, str]] = None
@@ -47,14 +46,15 @@ class RegistryUpdater:
         try:
             # Add the package to the registry
             if not self.core.add_package(repo_name, package_metadata, author):
-                self.logger.error(f"Failed to add package {package_metadata['name']} to repository {repo_name}")
+                self.logger.error("Failed to add package %s to repository %s", package_metadata['name'], repo_name)
                 return False
 
-            self.logger.info(f"Package {package_metadata['name']} added to repository {repo_name}.")
+            self.logger.info("Package %s added to repository %s.", package_metadata['name'], repo_name)
             return True
             
-        except Exception as e:
-            self.logger.error(f"Error adding package: {e}")
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            # Malformed metadata; anything else is a bug and propagates
+            self.logger.error("Error adding package: %s", e)
             return False
 
     def _add_new_package_version(self, repo_name: str, package_metadata: dict,
@@ -75,16 +75,55 @@ class RegistryUpdater:
         try:                
             # Update the registry
             if not self.core.add_new_package_version(repo_name, package_metadata, author):
-                self.logger.error(f"Failed to update registry for package {package_metadata['name']} in repository {repo_name}")
+                self.logger.error("Failed to update registry for package %s in repository %s", package_metadata['name'], repo_name)
                 return False
             
-            self.logger.info(f"Updated registry for package {package_metadata['name']} in repository {repo_name}.")
+            self.logger.info("Updated registry for package %s in repository %s.", package_metadata['name'], repo_name)
             return True
             
-        except Exception as e:
-            self.logger.error(f"Error updating package registry: {e}")
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            # Malformed metadata; anything else is a bug and propagates
+            self.logger.error("Error updating package registry: %s", e)
             return False
 
+    def _preflight(self, repo_name: str, package_dir: Path,
+                   metadata_path: str) -> Tuple[Optional[dict], Optional[str]]:
+        """
+        Run the cheap registry and file checks that precede package validation.
+        
+        Args:
+            repo_name: Repository name
+            package_dir: Path to the package directory
+            metadata_path: Path to the metadata file
+            
+        Returns:
+            Tuple[Optional[dict], Optional[str]]: (metadata, None) if every check passed,
+            otherwise (None, error message)
+        """
+        if self.core.find_repository(repo_name) is None:
+            return None, f"Repository {repo_name} not found"
+        
+        # is_dir() is False for missing paths, so a single stat covers both checks
+        if not package_dir.is_dir():
+            return None, f"Package directory does not exist or is not a directory: {package_dir}"
+        
+        metadata = self.core.load_metadata(package_dir, metadata_path)
+        if not metadata:
+            return None, f"Failed to load metadata from {package_dir}/{metadata_path}"
+        
+        package_name = metadata.get("name")
+        if not package_name:
+            return None, "Package name not found in provided package metadata file"
+        
+        version = metadata.get("version")
+        if not version:
+            return None, "Package version not found in provided package metadata file"
+        
+        if self.core.find_version(repo_name, package_name, version) is not None:
+            return None, f"Version {version} of package {package_name} already exists"
+        
+        return metadata, None
+    
     def validate_package(self, repo_name: str, package_dir: Path, metadata_path: str = "hatch_metadata.json") -> Tuple[bool, dict]:
         """
         Validate that a new package or package version can be added to the registry
@@ -100,41 +139,17 @@ class RegistryUpdater:
             will contain package metadata under the "metadata" key.
         """
         try:
-            # Validate repository exists
-            repo = self.core.find_repository(repo_name)
-            if not repo:
-                self.logger.error(f"Repository {repo_name} not found")
-                return False, {"valid": False, "errors": [f"Repository {repo_name} not found"]}
-                
-            # Validate package directory exists
-            if not package_dir.exists() or not package_dir.is_dir():
-                self.logger.error(f"Package directory does not exist or is not a directory: {package_dir}")
-                return False, {"valid": False, "errors": [f"Package directory does not exist or is not a directory: {package_dir}"]}
+            # Check the repository, package directory and metadata before validating
+            metadata, error = self._preflight(repo_name, package_dir, metadata_path)
+            if error:
+                self.logger.error(error)
+                return False, {"valid": False, "errors": [error]}
             
-            # Load metadata to get package name and version
-            metadata = self.core.load_metadata(package_dir, metadata_path)
-            if not metadata:
-                self.logger.error(f"Failed to load metadata from {package_dir}/{metadata_path}")
-                return False, {"valid": False, "errors": [f"Failed to load metadata from {package_dir}/{metadata_path}"]}
-                
-            package_name = metadata.get("name")
-            if not package_name:
-                self.logger.error("Package name not found in provided package metadata file")
-                return False, {"valid": False, "errors": ["Package name not found in provided package metadata file"]}
-                
-            version = metadata.get("version")
-            if not version:
-                self.logger.error("Package version not found in provided package metadata file")
-                return False, {"valid": False, "errors": ["Package version not found in provided package metadata file"]}
+            package_name = metadata["name"]
+            version = metadata["version"]
             
             # Check if package already exists
             existing_pkg = self.core.find_package(repo_name, package_name)
-            existing_version = None
-            if existing_pkg:
-                existing_version = self.core.find_version(repo_name, package_name, version)
-                if existing_version:
-                    self.logger.error(f"Version {version} of package {package_name} already exists")
-                    return False, {"valid": False, "errors": [f"Version {version} of package {package_name} already exists"]}
             
             # Create pending update tuple for circular dependency detection
             pending_update = (package_name, metadata)
@@ -142,11 +157,11 @@ class RegistryUpdater:
             # Validate the package with the validator
             is_valid, results = self.validator.validate_package(package_dir, pending_update)
             if not is_valid:
-                self.logger.error(f"Validation failed for package {package_name} version {version}")
+                self.logger.error("Validation failed for package %s version %s", package_name, version)
                 return False, results
                 
             # Package is valid and can be added to the registry
-            self.logger.info(f"Package {package_name} version {version} validation passed")
+            self.logger.info("Package %s version %s validation passed", package_name, version)
             
             # Return validation results with additional context
             results["is_new_package"] = not existing_pkg
@@ -154,8 +169,9 @@ class RegistryUpdater:
             return True, results
             
         except Exception as e:
-            self.logger.error(f"Error validating package: {e}")
-            return False, {"valid": False, "errors": [f"Error validating package: {str(e)}"]}
+            error = f"Error validating package: {e}"
+            self.logger.error(error)
+            return False, {"valid": False, "errors": [error]}
     
     def validate_and_add_package(self, repo_name: str, package_dir: Path, metadata_path: str = "hatch_metadata.json",
                                  author: Optional[Dict[str, str]] = None,
@@ -194,4 +210,36 @@ class RegistryUpdater:
                 author=author
             )
 
-        return added, validation_results
\ No newline at end of file
+        if added:
+            # The registry changed in place, so validation context must be rebuilt.
+            # Each successful add therefore rebuilds the validator by design, including
+            # within validate_and_add_packages; the cache only spares repeated
+            # validations that leave the registry unchanged.
+            self.validator.invalidate()
+
+        return added, validation_results
+
+    def validate_and_add_packages(self, repo_name: str, package_dirs: List[Path],
+                                  metadata_path: str = "hatch_metadata.json",
+                                  author: Optional[Dict[str, str]] = None,
+                                  ) -> List[Tuple[bool, dict]]:
+        """
+        Validate and add several packages, writing the registry file once at the end.
+        
+        Packages are processed in order, so a package may depend on one added earlier
+        in the same call. A package that fails validation is reported and skipped
+        without affecting the others.
+        
+        Args:
+            repo_name: Repository name
+            package_dirs: Paths to the package directories
+            metadata_path: Path to the metadata file within each package directory
+            author: Author information for the packages
+
+        Returns:
+            List[Tuple[bool, dict]]: (success, results or error information) for each
+            package directory, in the order given
+        """
+        with self.core.batch():
+            return [self.validate_and_add_package(repo_name, package_dir, metadata_path, author)
+                    for package_dir in package_dirs]
@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Any, Callable, List, Optional, Tuple, Union
 import logging
 import json
 
-# Import Hatch modules
-from hatch_validator import HatchPackageValidator
+# hatch_validator is imported when a validator is first needed, so that reading
+# the registry does not pay for loading it
+if TYPE_CHECKING:
+    from hatch_validator import HatchPackageValidator
 
 class RegistryValidationError(Exception):
     """Exception for package validation errors."""
@@ -14,15 +16,57 @@ class RegistryValidationError(Exception):
 class RegistryValidator:
     """Package validation functionality for registry operations."""
     
-    def __init__(self, registry_data: Dict[str, Any] = None):
+    def __init__(self, registry_data: Union[Dict[str, Any], Callable[[], Dict[str, Any]]] = None):
         """
         Initialize the registry validator.
         
         Args:
-            registry_data: Optional registry data for validation context
+            registry_data: Optional registry data for validation context, or a callable
+                returning it so that the current registry is read even if it is rebound
         """
         self.logger = logging.getLogger("hatch.registry.validator")
-        self.registry_data = registry_data
+        self._registry_source = registry_data
+        self._validator = None
+        self._validator_data = None
+    
+    @property
+    def registry_data(self) -> Optional[Dict[str, Any]]:
+        """Registry data, read through the callable if one was given."""
+        source = self._registry_source
+        return source() if callable(source) else source
+    
+    @registry_data.setter
+    def registry_data(self, registry_data: Union[Dict[str, Any], Callable[[], Dict[str, Any]]]) -> None:
+        self._registry_source = registry_data
+        self.invalidate()
+    
+    def invalidate(self) -> None:
+        """
+        Drop the cached package validator.
+        
+        Call this after changing the registry data in place, so that the next
+        validation builds its dependency context from the current registry.
+        """
+        self._validator = None
+        self._validator_data = None
+    
+    def _get_validator(self) -> "HatchPackageValidator":
+        """
+        Get the package validator, creating it on first use or when the registry
+        data has been replaced by a different object.
+        
+        Returns:
+            HatchPackageValidator: Validator bound to the current registry data
+        """
+        registry_data = self.registry_data
+        if self._validator is None or self._validator_data is not registry_data:
+            from hatch_validator import HatchPackageValidator
+            
+            self._validator = HatchPackageValidator(
+                allow_local_dependencies=False,
+                registry_data=registry_data)
+            self._validator_data = registry_data
+        return self._validator
     
     def validate_package(self, package_dir: Path, pending_update: Optional[Tuple[str, Dict]] = None) -> Tuple[bool, dict]:
         """
@@ -35,28 +79,26 @@ class RegistryValidator:
         Returns:
             Tuple of (is_valid, results)
         """
-        self.logger.debug(f"Validating package at: {package_dir}")
+        self.logger.debug("Validating package at: %s", package_dir)
         
         try:
-            # Initialize validator with registry data for dependency resolution
-            validator = HatchPackageValidator(
-                allow_local_dependencies=False,
-                registry_data=self.registry_data)
+            # Validator bound to the registry data for dependency resolution
+            validator = self._get_validator()
             
             # Run the validation
             is_valid, results = validator.validate_package(package_dir, pending_update)
             
             # Check if validation passed
             if is_valid:
-                self.logger.info(f"Package validation successful: {package_dir}")
+                self.logger.info("Package validation successful: %s", package_dir)
                 return True, results
             else:
-                self.logger.error(f"Package validation failed: {package_dir}")
+                self.logger.error("Package validation failed: %s", package_dir)
                 self._log_validation_errors(results, "Validation failed")
                 return False, results
                 
         except Exception as e:
-            self.logger.error(f"Error during package validation: {e}")
+            self.logger.error("Error during package validation: %s", e)
             return False, {"valid": False, "errors": [str(e)], "metadata": None}
     
     def validate_registry(self) -> Tuple[bool, dict]:
@@ -69,10 +111,8 @@ class RegistryValidator:
         self.logger.debug("Validating entire registry")
         
         try:
-            # Initialize validator with registry data for dependency resolution
-            validator = HatchPackageValidator(
-                allow_local_dependencies=False,
-                registry_data=self.registry_data)
+            # Validator bound to the registry data for dependency resolution
+            validator = self._get_validator()
             
             # Run the validation
             is_valid, errors_list = validator.validate_registry_metadata(metadata=self.registry_data)
@@ -84,12 +124,12 @@ class RegistryValidator:
             else:
                 self.logger.error("Registry validation failed")
                 for err in errors_list:
-                    self.logger.error(f"  Error: {err}")
+                    self.logger.error("  Error: %s", err)
                 return False, errors_list
                 
         except Exception as e:
-            self.logger.error(f"Error during registry validation: {e}")
-            return False, [e.message]
+            self.logger.error("Error during registry validation: %s", e)
+            return False, [str(e)]
     
     def _log_validation_errors(self, results: dict, message: str) -> None:
         """
@@ -99,15 +139,16 @@ class RegistryValidator:
             results: Validation results dictionary
             message: Message to include with the errors
         """
-        self.logger.error(f"{message}")
+        self.logger.error(message)
         
         if "errors" in results and results["errors"]:
             for i, error in enumerate(results["errors"]):
-                self.logger.error(f"  Error {i+1}: {error}")
+                self.logger.error("  Error %d: %s", i + 1, error)
                 
         if "dependency_errors" in results and results["dependency_errors"]:
             for i, error in enumerate(results["dependency_errors"]):
-                self.logger.error(f"  Dependency Error {i+1}: {error}")
+                self.logger.error("  Dependency Error %d: %s", i + 1, error)
                 
-        if "metadata" in results and results["metadata"]:
-            self.logger.debug(f"Package metadata: {json.dumps(results['metadata'], indent=2)}")
+        # Only serialize the metadata when the debug message will actually be emitted
+        if results.get("metadata") and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Package metadata: %s", json.dumps(results['metadata'], indent=2))
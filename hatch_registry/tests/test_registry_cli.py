@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+import sys
+import json
+import logging
+import tempfile
+import unittest
+import shutil
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path if needed for direct testing
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from hatch_registry.registry_cli import main, _parse_args_fast, _parse_args_argparse
+from hatch_registry.registry_core import RegistryCore
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("hatch.registry_cli_tests")
+
+
+class RegistryCliParsingTests(unittest.TestCase):
+    """Tests that the fast command line parser agrees with the argparse fallback."""
+
+    # Command lines the fast path must parse exactly as argparse does
+    ACCEPTED = [
+        ["list-repositories"],
+        ["list-repositories", "--json"],
+        ["--registry", "other/registry.json", "list-repositories"],
+        ["--registry=other/registry.json", "--log-level=DEBUG", "list-packages", "--repository-name", "repo"],
+        ["--log-level", "WARNING", "list-packages", "--repository-name=repo", "--json"],
+        ["list-packages", "--repository-name", "first", "--repository-name", "second"],
+        ["show-package", "--package-name", "pkg", "--repository-name", "repo", "--json"],
+        ["add-repository", "--name", "repo", "--url", "file:///repo"],
+        ["add-package", "--repository-name", "repo", "--package-dir", "packages/pkg"],
+        ["add-package", "--repository-name=repo", "--package-dir=packages/pkg",
+         "--author-github-id", "someone", "--author-email=someone@example.com"],
+        ["validate-package", "--package-dir", "packages/pkg", "--repository-name", "repo"],
+    ]
+
+    # Command lines the fast path must leave to argparse
+    REJECTED = [
+        [],
+        ["-h"],
+        ["--help"],
+        ["list-repositories", "-h"],
+        ["unknown-command"],
+        ["--reg", "other/registry.json", "list-repositories"],
+        ["list-packages", "--repo", "repo"],
+        ["list-repositories", "--unknown"],
+        ["list-repositories", "extra"],
+        ["list-repositories", "--json=yes"],
+        ["list-packages"],
+        ["list-packages", "--repository-name"],
+        ["list-packages", "--repository-name", "--json"],
+        ["add-package", "--repository-name", "repo"],
+        ["--log-level", "debug", "list-repositories"],
+        ["--log-level=VERBOSE", "list-repositories"],
+    ]
+
+    def test_fast_path_matches_argparse(self):
+        """Test that well-formed command lines parse to the same values on both paths."""
+        for argv in self.ACCEPTED:
+            with self.subTest(argv=argv):
+                fast = _parse_args_fast(argv)
+                self.assertIsNotNone(fast, "Fast path should accept a well-formed command line")
+                self.assertEqual(vars(fast), vars(_parse_args_argparse(argv)))
+
+    def test_path_options_are_converted(self):
+        """Test that path options are parsed to Path, including the default registry."""
+        args = _parse_args_fast(["validate-package", "--repository-name", "repo", "--package-dir", "packages/pkg"])
+        self.assertEqual(args.package_dir, Path("packages/pkg"))
+        self.assertIsInstance(args.registry, Path)
+
+    def test_fast_path_rejects_other_command_lines(self):
+        """Test that help, abbreviations, unknown or missing options and bad levels fall back to argparse."""
+        for argv in self.REJECTED:
+            with self.subTest(argv=argv):
+                self.assertIsNone(_parse_args_fast(argv))
+
+
+class RegistryCliJsonTests(unittest.TestCase):
+    """Tests for the --json output of the read-only commands."""
+
+    def setUp(self):
+        """Set up a registry holding one repository with one package."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.registry_path = Path(self.temp_dir) / "test_registry.json"
+
+        self.core = RegistryCore(self.registry_path)
+        self.repo_name = "test-repo"
+        self.core.add_repository(self.repo_name, "file:///test-repo")
+        self.core.add_package(self.repo_name, {
+            "name": "pkg_a",
+            "version": "1.0.0",
+            "description": "Test package pkg_a",
+            "tags": ["test"],
+            "author": {"name": "tester", "email": "tester@example.com"},
+            "hatch_dependencies": [],
+            "python_dependencies": [],
+            "compatibility": {},
+        })
+
+    def _run_json(self, *command) -> object:
+        """Run the CLI against the test registry and return its stdout parsed as JSON."""
+        argv = ["registry_cli", "--registry", str(self.registry_path), *command, "--json"]
+        stdout = StringIO()
+        with mock.patch.object(sys, "argv", argv), redirect_stdout(stdout):
+            with self.assertRaises(SystemExit) as exit_info:
+                main()
+        self.assertEqual(exit_info.exception.code, 0)
+        return json.loads(stdout.getvalue())
+
+    def test_list_repositories_json(self):
+        """Test that list-repositories --json prints the repositories."""
+        repositories = self._run_json("list-repositories")
+        self.assertEqual([repo["name"] for repo in repositories], [self.repo_name])
+        self.assertEqual(repositories[0]["url"], "file:///test-repo")
+
+    def test_list_packages_json(self):
+        """Test that list-packages --json prints the repository's packages."""
+        packages = self._run_json("list-packages", "--repository-name", self.repo_name)
+        self.assertEqual([pkg["name"] for pkg in packages], ["pkg_a"])
+        self.assertEqual(packages[0]["latest_version"], "1.0.0")
+
+    def test_show_package_json(self):
+        """Test that show-package --json prints the package as stored in the registry."""
+        pkg = self._run_json("show-package", "--repository-name", self.repo_name, "--package-name", "pkg_a")
+        self.assertEqual(pkg, self.core.find_package(self.repo_name, "pkg_a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
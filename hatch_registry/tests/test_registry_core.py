@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+import sys
+import json
+import logging
+import tempfile
+import unittest
+import shutil
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path if needed for direct testing
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from hatch_registry.registry_core import RegistryCore
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("hatch.registry_core_tests")
+
+
+class RegistryCoreTests(unittest.TestCase):
+    """Tests for the registry core data management, without package validation."""
+
+    def setUp(self):
+        """Set up test environment before each test."""
+        # Create a temporary directory for test registry
+        self.temp_dir = tempfile.mkdtemp()
+        self.registry_path = Path(self.temp_dir) / "test_registry.json"
+        
+        # Initialize registry core, which creates a new registry file
+        self.core = RegistryCore(self.registry_path)
+        self.repo_name = "test-repo"
+        self.core.add_repository(self.repo_name, "file:///test-repo")
+        
+    def tearDown(self):
+        """Clean up test environment after each test."""
+        shutil.rmtree(self.temp_dir)
+    
+    def _make_metadata(self, name: str, version: str, **fields) -> dict:
+        """Build minimal package metadata for a package version."""
+        metadata = {
+            "name": name,
+            "version": version,
+            "description": f"Test package {name}",
+            "tags": [],
+            "author": {"name": "tester", "email": "tester@example.com"},
+            "hatch_dependencies": [],
+            "python_dependencies": [],
+            "compatibility": {},
+        }
+        metadata.update(fields)
+        return metadata
+    
+    def _read_registry_file(self) -> dict:
+        """Read the registry as currently saved on disk."""
+        with open(self.registry_path, 'r') as f:
+            return json.load(f)
+    
+    def test_batch_defers_save_until_exit(self):
+        """Test that mutations inside a batch are written once, when the batch exits."""
+        with self.core.batch():
+            self.core.add_repository("repo-a", "file:///repo-a")
+            self.core.add_package(self.repo_name, self._make_metadata("pkg_a", "1.0.0"))
+            
+            # Nothing has been written yet
+            saved = self._read_registry_file()
+            self.assertEqual([r["name"] for r in saved["repositories"]], [self.repo_name])
+        
+        saved = self._read_registry_file()
+        self.assertEqual([r["name"] for r in saved["repositories"]], [self.repo_name, "repo-a"])
+        self.assertEqual(saved["stats"]["total_packages"], 1)
+    
+    def test_nested_batches_save_on_outermost_exit(self):
+        """Test that only the outermost batch writes the registry file."""
+        with self.core.batch():
+            with self.core.batch():
+                self.core.add_repository("repo-a", "file:///repo-a")
+            saved = self._read_registry_file()
+            self.assertIsNone(next((r for r in saved["repositories"] if r["name"] == "repo-a"), None))
+        
+        saved = self._read_registry_file()
+        self.assertIsNotNone(next((r for r in saved["repositories"] if r["name"] == "repo-a"), None))
+    
+    def test_unchanged_batch_does_not_save(self):
+        """Test that a batch without effective mutations leaves the registry file untouched."""
+        before = self.registry_path.stat().st_mtime_ns
+        with self.core.batch():
+            self.assertFalse(self.core.add_repository(self.repo_name, "file:///test-repo"))
+        self.assertEqual(self.registry_path.stat().st_mtime_ns, before)
+    
+    def test_lookups_follow_mutations(self):
+        """Test that repository, package and version lookups reflect additions and removals."""
+        self.assertTrue(self.core.add_package(self.repo_name, self._make_metadata("pkg_a", "1.0.0")))
+        self.assertTrue(self.core.add_new_package_version(self.repo_name, self._make_metadata("pkg_a", "1.1.0")))
+        
+        self.assertIs(self.core.find_repository(self.repo_name), self.core.registry_data["repositories"][0])
+        self.assertEqual(self.core.find_package(self.repo_name, "pkg_a")["name"], "pkg_a")
+        self.assertEqual(self.core.find_version(self.repo_name, "pkg_a", "1.1.0")["version"], "1.1.0")
+        self.assertIsNone(self.core.find_package("other-repo", "pkg_a"))
+        
+        self.assertTrue(self.core.remove_version(self.repo_name, "pkg_a", "1.1.0"))
+        self.assertIsNone(self.core.find_version(self.repo_name, "pkg_a", "1.1.0"))
+        self.assertIsNotNone(self.core.find_version(self.repo_name, "pkg_a", "1.0.0"))
+        
+        self.assertTrue(self.core.remove_package(self.repo_name, "pkg_a"))
+        self.assertIsNone(self.core.find_package(self.repo_name, "pkg_a"))
+        self.assertIsNone(self.core.find_version(self.repo_name, "pkg_a", "1.0.0"))
+        
+        self.assertTrue(self.core.remove_repository(self.repo_name))
+        self.assertIsNone(self.core.find_repository(self.repo_name))
+        
+        # A fresh core loading the saved file sees the same registry
+        self.assertIsNone(RegistryCore(self.registry_path).find_repository(self.repo_name))
+    
+    def test_batch_shares_one_timestamp(self):
+        """Test that all mutations inside a batch record the same timestamp."""
+        with self.core.batch():
+            self.core.add_package(self.repo_name, self._make_metadata("pkg_a", "1.0.0"))
+            self.core.add_package(self.repo_name, self._make_metadata("pkg_b", "1.0.0"))
+            self.core.update_repository_timestamp(self.repo_name)
+        
+        added_a = self.core.find_version(self.repo_name, "pkg_a", "1.0.0")["added_date"]
+        added_b = self.core.find_version(self.repo_name, "pkg_b", "1.0.0")["added_date"]
+        self.assertEqual(added_a, added_b)
+        self.assertEqual(self.core.find_repository(self.repo_name)["last_indexed"], added_a)
+        self.assertEqual(self._read_registry_file()["last_updated"], added_a)
+    
+    def test_latest_version_follows_version_order(self):
+        """Test that latest_version uses version precedence rather than string or insertion order."""
+        self.core.add_package(self.repo_name, self._make_metadata("pkg_a", "2.0.0"))
+        self.core.add_new_package_version(self.repo_name, self._make_metadata("pkg_a", "10.0.0"))
+        self.assertEqual(self.core.find_package(self.repo_name, "pkg_a")["latest_version"], "10.0.0")
+        
+        # An older release added later does not become the latest
+        self.core.add_new_package_version(self.repo_name, self._make_metadata("pkg_a", "9.1.0"))
+        self.assertEqual(self.core.find_package(self.repo_name, "pkg_a")["latest_version"], "10.0.0")
+        
+        # Removing the latest falls back to the highest remaining version
+        self.core.remove_version(self.repo_name, "pkg_a", "10.0.0")
+        self.assertEqual(self.core.find_package(self.repo_name, "pkg_a")["latest_version"], "9.1.0")
+    
+    def test_noop_updates_do_not_save(self):
+        """Test that updates leaving every value unchanged neither report success nor save."""
+        self.core.add_package(self.repo_name, self._make_metadata("pkg_a", "1.0.0", tags=["x"]))
+        saved = self.registry_path.stat().st_mtime_ns
+        
+        self.assertFalse(self.core.update_package_metadata(self.repo_name, "pkg_a", {}))
+        self.assertFalse(self.core.update_package_metadata(self.repo_name, "pkg_a", {"tags": ["x"]}))
+        self.assertFalse(self.core.update_version(self.repo_name, "pkg_a", "1.0.0", {"version": "2.0.0"}))
+        self.assertEqual(self.registry_path.stat().st_mtime_ns, saved)
+        
+        self.assertTrue(self.core.update_package_metadata(self.repo_name, "pkg_a", {"tags": ["y"]}))
+        self.assertEqual(self._read_registry_file()["repositories"][0]["packages"][0]["tags"], ["y"])
+    
+    def test_reindex_picks_up_direct_edits(self):
+        """Test that reindex makes lookups reflect changes made directly to registry_data."""
+        self.core.registry_data["repositories"].append({"name": "edited-repo", "url": "file:///edited"})
+        self.assertIsNone(self.core.find_repository("edited-repo"))
+        
+        self.core.reindex()
+        self.assertEqual(self.core.find_repository("edited-repo")["url"], "file:///edited")
+        self.assertEqual(self.core.find_repository("edited-repo")["packages"], [])
+    
+    def test_reconstruction_cache_follows_changes(self):
+        """Test that cached reconstructions are not reused after the versions they derive from change."""
+        deps = [{"name": "requests", "version_constraint": ">=2.0"}]
+        self.core.add_package(self.repo_name, self._make_metadata("pkg_a", "1.0.0"))
+        self.core.add_new_package_version(self.repo_name, self._make_metadata("pkg_a", "1.1.0", python_dependencies=deps))
+        
+        # Older releases keep 1.1.0 as the latest, so they are diffed against the same reconstruction
+        self.core.add_new_package_version(self.repo_name, self._make_metadata("pkg_a", "1.0.1", python_dependencies=deps))
+        self.assertNotIn("python_dependencies_added", self.core.find_version(self.repo_name, "pkg_a", "1.0.1"))
+        
+        # Changing the latest version's diff must be reflected in the next diff
+        self.core.update_version(self.repo_name, "pkg_a", "1.1.0", {"python_dependencies_added": []})
+        self.core.add_new_package_version(self.repo_name, self._make_metadata("pkg_a", "1.0.2", python_dependencies=deps))
+        self.assertEqual(self.core.find_version(self.repo_name, "pkg_a", "1.0.2")["python_dependencies_added"], deps)
+
+    def test_new_version_diffs_against_root(self):
+        """Test that a new version is diffed against the root version's own dependencies and compatibility."""
+        deps = [{"name": "requests", "version_constraint": ">=2.0"}]
+        self.core.add_package(self.repo_name, self._make_metadata(
+            "pkg_a", "1.0.0", python_dependencies=deps, compatibility={"python": ">=3.8"}))
+
+        # Nothing declared by the root is stored again
+        self.core.add_new_package_version(self.repo_name, self._make_metadata(
+            "pkg_a", "1.1.0", python_dependencies=deps, compatibility={"python": ">=3.8"}))
+        version = self.core.find_version(self.repo_name, "pkg_a", "1.1.0")
+        self.assertNotIn("python_dependencies_added", version)
+        self.assertNotIn("compatibility_changes", version)
+
+        # Only what differs from the root is recorded
+        self.core.add_new_package_version(self.repo_name, self._make_metadata(
+            "pkg_a", "1.2.0", compatibility={"python": ">=3.9"}))
+        version = self.core.find_version(self.repo_name, "pkg_a", "1.2.0")
+        self.assertEqual(version["python_dependencies_removed"], ["requests"])
+        self.assertEqual(version["compatibility_changes"], {"python": ">=3.9"})
+
+    def test_failed_save_keeps_registry_and_cleans_up(self):
+        """Test that a failing save leaves the previous registry file and no temporary file behind."""
+        before = self._read_registry_file()
+        with mock.patch("hatch_registry.registry_core.os.replace", side_effect=OSError("disk full")):
+            self.core.registry_data["repositories"].clear()
+            self.assertFalse(self.core._save_registry())
+        
+        self.assertEqual(self._read_registry_file(), before)
+        self.assertEqual(sorted(p.name for p in Path(self.temp_dir).iterdir()), ["test_registry.json"])
+    
+    def test_compact_registry_round_trips(self):
+        """Test that a registry saved without indentation is written on one line and loads back."""
+        compact_path = Path(self.temp_dir) / "compact_registry.json"
+        core = RegistryCore(compact_path, pretty=False)
+        core.add_repository(self.repo_name, "file:///test-repo")
+        
+        self.assertNotIn(b"\n", compact_path.read_bytes())
+        self.assertEqual(RegistryCore(compact_path).find_repository(self.repo_name)["url"], "file:///test-repo")
+        
+        # The default remains the indented layout
+        self.assertIn(b'\n  "', self.registry_path.read_bytes())
+    
+    def test_stats_follow_adds_and_removals(self):
+        """Test that removals decrement the stats and recompute_stats agrees with the running totals."""
+        self.core.add_package(self.repo_name, self._make_metadata("pkg_a", "1.0.0"))
+        self.core.add_new_package_version(self.repo_name, self._make_metadata("pkg_a", "1.1.0"))
+        self.core.add_package(self.repo_name, self._make_metadata("pkg_b", "1.0.0"))
+        self.core.find_version(self.repo_name, "pkg_b", "1.0.0")["artifacts"] = [{"name": "wheel"}]
+        self.core.recompute_stats()
+        self.assertEqual(self.core.registry_data["stats"],
+                         {"total_packages": 2, "total_versions": 3, "total_artifacts": 1})
+
+        self.core.remove_version(self.repo_name, "pkg_a", "1.1.0")
+        self.core.remove_package(self.repo_name, "pkg_b")
+        self.assertEqual(self.core.registry_data["stats"],
+                         {"total_packages": 1, "total_versions": 1, "total_artifacts": 0})
+
+        self.core.remove_repository(self.repo_name)
+        self.assertEqual(self._read_registry_file()["stats"],
+                         {"total_packages": 0, "total_versions": 0, "total_artifacts": 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
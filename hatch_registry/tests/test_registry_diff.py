@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+import sys
+import logging
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path if needed for direct testing
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from hatch_registry.registry_diff import RegistryDiff
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("hatch.registry_diff_tests")
+
+
+class RegistryDiffTests(unittest.TestCase):
+    """Tests for differential version storage and reconstruction."""
+
+    def setUp(self):
+        """Set up test environment before each test."""
+        self.diff = RegistryDiff()
+        self.package = {
+            "name": "pkg_a",
+            "versions": [
+                {
+                    "version": "1.0.0",
+                    "hatch_dependencies_added": [{"name": "base_pkg", "version_constraint": ">=1.0"}],
+                    "python_dependencies_added": [
+                        {"name": "requests", "version_constraint": ">=2.0", "package_manager": "pip"},
+                        {"name": "numpy", "version_constraint": ">=1.20", "package_manager": "pip"},
+                    ],
+                    "compatibility_changes": {"python": ">=3.8"},
+                },
+                {
+                    "version": "1.1.0",
+                    "base_version": "1.0.0",
+                    "python_dependencies_removed": ["requests"],
+                    "python_dependencies_modified": [
+                        {"name": "numpy", "version_constraint": ">=1.24", "package_manager": "pip"},
+                    ],
+                },
+                {
+                    "version": "1.2.0",
+                    "base_version": "1.1.0",
+                    "hatch_dependencies_added": [{"name": "extra_pkg", "version_constraint": ">=0.1"}],
+                    "compatibility_changes": {"hatchling": ">=0.2"},
+                },
+            ],
+            "latest_version": "1.2.0",
+        }
+
+    def test_reconstruct_root_version(self):
+        """Test that the root version reconstructs to its own added dependencies."""
+        result = self.diff.reconstruct_package_version(self.package, self.package["versions"][0])
+
+        self.assertEqual(result["version"], "1.0.0")
+        self.assertEqual([d["name"] for d in result["hatch_dependencies"]], ["base_pkg"])
+        self.assertEqual([d["name"] for d in result["python_dependencies"]], ["requests", "numpy"])
+        self.assertEqual(result["compatibility"], {"python": ">=3.8"})
+
+    def test_reconstruct_walks_chain_to_root(self):
+        """Test that reconstruction applies every diff from the root up to the requested version."""
+        result = self.diff.reconstruct_package_version(self.package)
+
+        self.assertEqual(result["version"], "1.2.0")
+        self.assertEqual([d["name"] for d in result["hatch_dependencies"]], ["base_pkg", "extra_pkg"])
+        self.assertEqual(result["python_dependencies"],
+                         [{"name": "numpy", "version_constraint": ">=1.24", "package_manager": "pip"}])
+        self.assertEqual(result["compatibility"], {"python": ">=3.8", "hatchling": ">=0.2"})
+
+    def test_reconstruct_stops_at_missing_base(self):
+        """Test that a base version missing from the package ends the walk instead of looping."""
+        del self.package["versions"][1]
+        result = self.diff.reconstruct_package_version(self.package)
+
+        self.assertEqual(result["version"], "1.2.0")
+        self.assertEqual([d["name"] for d in result["hatch_dependencies"]], ["extra_pkg"])
+
+    def test_dependency_diff_with_empty_side(self):
+        """Test that diffs against an empty side report everything as added or removed."""
+        deps = [{"name": "a", "version_constraint": ">=1"}, {"name": "b", "version_constraint": ">=2"}]
+
+        self.assertEqual(self.diff.compute_dependency_diff([], deps), (deps, [], []))
+        self.assertEqual(self.diff.compute_dependency_diff(deps, []), ([], ["a", "b"], []))
+        self.assertEqual(self.diff.compute_dependency_diff([], []), ([], [], []))
+        self.assertEqual(self.diff.compute_compatibility_diff({}, {}), {})
+
+    def test_compute_all_diffs_keeps_only_changes(self):
+        """Test that the combined diff reports each kind of change and omits empty ones."""
+        base = self.diff.reconstruct_package_version(self.package, self.package["versions"][0])
+        new = {
+            "hatch_dependencies": base["hatch_dependencies"],
+            "python_dependencies": [{"name": "numpy", "version_constraint": ">=2.0", "package_manager": "pip"}],
+            "compatibility": {"python": ">=3.10"},
+        }
+
+        self.assertEqual(self.diff.compute_all_diffs(base, new), {
+            "python_dependencies_removed": ["requests"],
+            "python_dependencies_modified": new["python_dependencies"],
+            "compatibility_changes": {"python": ">=3.10"},
+        })
+
+    def test_compute_all_diffs_skips_unchanged_sections(self):
+        """Test that sections equal on both sides are not diffed item by item."""
+        base = self.diff.reconstruct_package_version(self.package)
+        new = dict(base, version="1.3.0")
+
+        with mock.patch.object(self.diff, "_compute_generic_diff") as generic_diff:
+            self.assertEqual(self.diff.compute_all_diffs(base, new), {})
+        generic_diff.assert_not_called()
+
+    def test_reconstruction_cache_reuses_base_and_clears(self):
+        """Test that cached reconstructions feed later versions and are dropped by clear_cache."""
+        middle = self.diff.reconstruct_package_version(self.package, self.package["versions"][1])
+        middle["python_dependencies"].clear()
+
+        # The caller's copy is independent of the cached base used for 1.2.0
+        latest = self.diff.reconstruct_package_version(self.package)
+        self.assertEqual([d["name"] for d in latest["python_dependencies"]], ["numpy"])
+
+        self.package["versions"][2]["hatch_dependencies_removed"] = ["base_pkg"]
+        self.diff.clear_cache()
+        latest = self.diff.reconstruct_package_version(self.package)
+        self.assertEqual([d["name"] for d in latest["hatch_dependencies"]], ["extra_pkg"])
+
+    def test_dependency_diff_follows_input_order(self):
+        """Test that diff results are deterministic and keep the order of the input lists."""
+        old = [{"name": n, "version_constraint": ">=1"} for n in ("zeta", "alpha", "mid", "beta")]
+        new = [{"name": n, "version_constraint": ">=2"} for n in ("mid", "zeta")]
+        new += [{"name": n, "version_constraint": ">=1"} for n in ("yank", "add")]
+
+        added, removed, modified = self.diff.compute_dependency_diff(old, new)
+        self.assertEqual([d["name"] for d in added], ["yank", "add"])
+        self.assertEqual(removed, ["alpha", "beta"])
+        self.assertEqual([d["name"] for d in modified], ["mid", "zeta"])
+
+
+if __name__ == '__main__':
+    unittest.main()
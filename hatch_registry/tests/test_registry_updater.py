@@ -8,11 +8,13 @@ import unittest
 import shutil
 from pathlib import Path
 from datetime import datetime
+from unittest import mock
 from typing import Dict, List, Any, Tuple
 
 # Add parent directory to path if needed for direct testing
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from hatch_registry.registry_diff import RegistryDiff
 from hatch_registry.registry_updater import RegistryUpdater
 
 # Configure logging
@@ -22,17 +24,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger("hatch.registry_tests")
 
+# Keep test registries in memory where a tmpfs is available, so that the
+# registry writes and fsyncs done by every added package do not hit the disk
+_TMP_ROOT = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
 
 class RegistryUpdaterTests(unittest.TestCase):
     """Tests for the registry updater functionality."""
 
-    def setUp(self):
-        """Set up test environment before each test."""
-        # Create a temporary directory for test registry
-        self.temp_dir = tempfile.mkdtemp()
-        self.registry_path = Path(self.temp_dir) / "test_registry.json"
+    @classmethod
+    def setUpClass(cls):
+        """Build the registry file that every test of the class starts from."""
+        # Path to Hatching-Dev packages
+        cls.hatch_dev_path = Path(__file__).parent.parent.parent.parent / "Hatching-Dev"
+        cls.repo_name = "test-repo"
         
-        # Create a test registry file
+        # Create a test registry file holding the test repository
+        cls._template_dir = tempfile.mkdtemp(dir=_TMP_ROOT)
+        cls.addClassCleanup(shutil.rmtree, cls._template_dir, ignore_errors=True)
+        cls._template_path = Path(cls._template_dir) / "template_registry.json"
         test_registry = {
             "registry_schema_version": "1.0.0",
             "last_updated": datetime.now().isoformat(),
@@ -44,25 +54,42 @@ class RegistryUpdaterTests(unittest.TestCase):
             }
         }
         
-        with open(self.registry_path, 'w') as f:
+        with open(cls._template_path, 'w') as f:
             json.dump(test_registry, f, indent=2)
-            
-        # Path to Hatching-Dev packages
-        self.hatch_dev_path = Path(__file__).parent.parent.parent.parent / "Hatching-Dev"
+        RegistryUpdater(cls._template_path).core.add_repository(cls.repo_name, "file:///test-repo")
+        
+        # Registry holding the base packages, built by the first test that needs it
+        cls._base_packages_template = None
+    
+    def setUp(self):
+        """Set up test environment before each test."""
+        # Each test works on its own copy of the registry template
+        self.temp_dir = tempfile.mkdtemp(dir=_TMP_ROOT)
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.registry_path = Path(self.temp_dir) / "test_registry.json"
+        shutil.copyfile(self._template_path, self.registry_path)
+        
         self.assertTrue(self.hatch_dev_path.exists(), 
                        f"Hatching-Dev directory not found at {self.hatch_dev_path}")
         
         # Initialize registry updater
         self.registry_updater = RegistryUpdater(self.registry_path)
         
-        # Add a test repository
-        self.repo_name = "test-repo"
-        self.registry_updater.core.add_repository(self.repo_name, "file:///test-repo")
-        
-    def tearDown(self):
-        """Clean up test environment after each test."""
-        # Remove temporary directory
-        shutil.rmtree(self.temp_dir)
+    def _use_base_packages_registry(self):
+        """Start the test from a registry that already holds base_pkg_1, base_pkg_2 and python_dep_pkg."""
+        cls = type(self)
+        if cls._base_packages_template is None:
+            template_path = Path(cls._template_dir) / "base_packages_registry.json"
+            shutil.copyfile(cls._template_path, template_path)
+            base_packages = ["base_pkg_1", "base_pkg_2", "python_dep_pkg"]
+            results = RegistryUpdater(template_path).validate_and_add_packages(
+                self.repo_name, [self.hatch_dev_path / base_pkg for base_pkg in base_packages])
+            for base_pkg, (result, _) in zip(base_packages, results):
+                self.assertTrue(result, f"Failed to add base package: {base_pkg}")
+            cls._base_packages_template = template_path
+        
+        shutil.copyfile(cls._base_packages_template, self.registry_path)
+        self.registry_updater = RegistryUpdater(self.registry_path)
     
     def test_add_valid_package(self):
         """Test adding a valid package to the registry."""
@@ -91,10 +118,9 @@ class RegistryUpdaterTests(unittest.TestCase):
         self.assertTrue(is_valid, "Registry validation failed after adding a valid package")
     
     def test_add_simple_dependency_package(self):
-        """Test adding a package with simple dependencies."""        # First add the base package that will be a dependency
-        base_pkg_path = self.hatch_dev_path / "base_pkg_1"
-        result, _ = self.registry_updater.validate_and_add_package(self.repo_name, base_pkg_path)
-        self.assertTrue(result, "Failed to add base package")
+        """Test adding a package with simple dependencies."""
+        # Start from the base packages, including base_pkg_1 that will be a dependency
+        self._use_base_packages_registry()
         
         # Then add a package that depends on it
         dependent_pkg_path = self.hatch_dev_path / "simple_dep_pkg"
@@ -162,15 +188,9 @@ class RegistryUpdaterTests(unittest.TestCase):
         self.assertTrue(is_valid, "Registry validation failed after adding packages")
     
     def test_add_complex_dependencies(self):
-        """Test adding a package with complex dependencies."""        # First add all the base packages
-        for base_pkg in ["base_pkg_1", "base_pkg_2", "python_dep_pkg"]:
-            pkg_path = self.hatch_dev_path / base_pkg
-            if not pkg_path.exists():
-                logger.warning(f"Base package not found: {pkg_path}")
-                continue
-                
-            result, _ = self.registry_updater.validate_and_add_package(self.repo_name, pkg_path)
-            self.assertTrue(result, f"Failed to add base package: {base_pkg}")
+        """Test adding a package with complex dependencies."""
+        # Start from all the base packages
+        self._use_base_packages_registry()
         
         # Now add the complex dependency package
         complex_pkg_path = self.hatch_dev_path / "complex_dep_pkg"
@@ -190,14 +210,8 @@ class RegistryUpdaterTests(unittest.TestCase):
     
     def test_add_version_dependency(self):
         """Test adding a package with version-specific dependencies."""        
-        # First add the base package
-        base_pkg_path = self.hatch_dev_path / "base_pkg_1"
-        if not base_pkg_path.exists():
-            logger.warning(f"Base package not found: {base_pkg_path}")
-            return
-            
-        result, _ = self.registry_updater.validate_and_add_package(self.repo_name, base_pkg_path)
-        self.assertTrue(result, "Failed to add base package")
+        # Start from the base packages, including base_pkg_1
+        self._use_base_packages_registry()
         
         # Then add a package with version-specific dependency
         version_dep_pkg_path = self.hatch_dev_path / "version_dep_pkg"
@@ -268,10 +282,13 @@ class RegistryUpdaterTests(unittest.TestCase):
         self.assertTrue("base_version" in version, "Base version reference should be present")
         self.assertEqual(version["base_version"], "1.0.0", "Base version should be 1.0.0")
         
-        # Verify that the metadata for compatibility changes is correct
-        self.assertTrue("compatibility_changes" in version, "Compatibility changes should be recorded")
-        compatibility_changes = version.get("compatibility_changes", [])
-        self.assertEqual(compatibility_changes["python"], ">=3.8", "Python compatibility should be >=3.8")
+        # Verify that the metadata for compatibility changes is correct. The diff is taken
+        # against the complete 1.0.0 version, which declares no compatibility constraints,
+        # so only the new python constraint is recorded.
+        self.assertEqual(version.get("compatibility_changes"), {"python": ">=3.8"},
+                         "Only the python compatibility >=3.8 should be recorded")
+        reconstructed = RegistryDiff().reconstruct_package_version(pkg, version)
+        self.assertEqual(reconstructed["compatibility"], {"python": ">=3.8"}, "Python compatibility should be >=3.8")
         
         # Verify stats were updated
         stats = self.registry_updater.core.registry_data["stats"]
@@ -320,6 +337,11 @@ class RegistryUpdaterTests(unittest.TestCase):
         self.assertEqual(python_deps_added[0]["name"], "requests", "Should have added requests dependency")
         self.assertEqual(python_deps_added[0]["version_constraint"], ">=2.25.0", "Version constraint should match")
         
+        # The complete 1.2.0 version holds the new dependency
+        reconstructed = RegistryDiff().reconstruct_package_version(pkg, version)
+        self.assertIn("requests", [dep["name"] for dep in reconstructed["python_dependencies"]],
+                      "Reconstructed version should depend on requests")
+        
         # Verify stats were updated
         stats = self.registry_updater.core.registry_data["stats"]
         self.assertEqual(stats["total_packages"], 1, "Should still have 1 package")
@@ -373,6 +395,11 @@ class RegistryUpdaterTests(unittest.TestCase):
         python_deps_removed = version.get("python_dependencies_removed", [])
         self.assertEqual(len(python_deps_removed), 1, "Should have removed one Python dependency")
         self.assertEqual(python_deps_removed[0], "requests", "Should have removed requests dependency")
+        
+        # The complete 1.3.0 version no longer holds the dependency
+        reconstructed = RegistryDiff().reconstruct_package_version(pkg, version)
+        self.assertNotIn("requests", [dep["name"] for dep in reconstructed["python_dependencies"]],
+                         "Reconstructed version should not depend on requests")
 
         # Verify stats were updated
         stats = self.registry_updater.core.registry_data["stats"]
@@ -387,27 +414,32 @@ class RegistryUpdaterTests(unittest.TestCase):
 class RegistryIntegrationTests(unittest.TestCase):
     """Integration tests for the registry functionality with real packages."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the registry file that every test of the class starts from."""
+        # Path to Hatching-Dev packages
+        cls.hatch_dev_path = Path(__file__).parent.parent.parent.parent / "Hatching-Dev"
+        cls.repo_name = "hatching-dev"
+        
+        # A new registry holding the test repository
+        cls._template_dir = tempfile.mkdtemp(dir=_TMP_ROOT)
+        cls.addClassCleanup(shutil.rmtree, cls._template_dir, ignore_errors=True)
+        cls._template_path = Path(cls._template_dir) / "template_registry.json"
+        RegistryUpdater(cls._template_path).core.add_repository(cls.repo_name, "file:///hatching-dev")
+    
     def setUp(self):
         """Set up test environment before each test."""
-        # Use a temporary registry file for testing
-        self.temp_dir = tempfile.mkdtemp()
+        # Each test works on its own copy of the registry template
+        self.temp_dir = tempfile.mkdtemp(dir=_TMP_ROOT)
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
         self.registry_path = Path(self.temp_dir) / "integration_registry.json"
+        shutil.copyfile(self._template_path, self.registry_path)
                 
-        # Path to Hatching-Dev packages
-        self.hatch_dev_path = Path(__file__).parent.parent.parent.parent / "Hatching-Dev"
         self.assertTrue(self.hatch_dev_path.exists(), 
                         f"Hatching-Dev directory not found at {self.hatch_dev_path}")
         
         # Initialize registry updater
         self.registry_updater = RegistryUpdater(self.registry_path)
-        
-        # Add a test repository
-        self.repo_name = "hatching-dev"
-        self.registry_updater.core.add_repository(self.repo_name, "file:///hatching-dev")
-    
-    def tearDown(self):
-        """Clean up test environment after each test."""
-        shutil.rmtree(self.temp_dir)
     
     def test_bulk_add_packages(self):
         """Test adding multiple packages to the registry."""
@@ -438,7 +470,23 @@ class RegistryIntegrationTests(unittest.TestCase):
         # Finally, test for the integrity of the registry
         is_valid, validation_results = self.registry_updater.validator.validate_registry()
         self.assertTrue(is_valid, "Registry validation failed after adding packages")
-    
+
+    def test_bulk_add_packages_in_one_batch(self):
+        """Test adding multiple packages with a single registry write."""
+        package_names = ["arithmetic_pkg", "base_pkg_1", "base_pkg_2", "python_dep_pkg", "simple_dep_pkg"]
+        package_dirs = [self.hatch_dev_path / pkg_name for pkg_name in package_names]
+
+        core = self.registry_updater.core
+        with mock.patch.object(core, "_write_registry_file", wraps=core._write_registry_file) as write:
+            results = self.registry_updater.validate_and_add_packages(self.repo_name, package_dirs)
+        self.assertEqual([added for added, _ in results], [True] * len(package_names))
+        self.assertEqual(write.call_count, 1, "The batch should write the registry once")
+
+        # Every package was written by the single save at the end of the batch
+        with open(self.registry_path, 'r') as f:
+            saved = json.load(f)
+        self.assertEqual(saved["stats"]["total_packages"], len(package_names))
+
     def test_failing_packages(self):
         """Test packages that should fail to add."""
         # First add some base packages for dependency resolution
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+import sys
+import logging
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path if needed for direct testing
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from hatch_registry.registry_validator import RegistryValidator
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("hatch.registry_validator_tests")
+
+
+class RegistryValidatorCacheTests(unittest.TestCase):
+    """Tests for reusing one HatchPackageValidator across validations."""
+
+    def setUp(self):
+        """Replace hatch_validator with a module whose validator class records each build."""
+        self.validator_class = mock.MagicMock(name="HatchPackageValidator")
+        self.validator_class.return_value.validate_package.return_value = (True, {"valid": True})
+        self.validator_class.return_value.validate_registry_metadata.return_value = (True, [])
+        patcher = mock.patch.dict(sys.modules, {
+            "hatch_validator": mock.Mock(HatchPackageValidator=self.validator_class)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.registry_data = {"repositories": []}
+        self.validator = RegistryValidator(self.registry_data)
+
+    def test_validator_built_once(self):
+        """Test that repeated validations reuse the validator built by the first one."""
+        for _ in range(3):
+            self.assertTrue(self.validator.validate_package(Path("pkg"))[0])
+        self.assertTrue(self.validator.validate_registry()[0])
+
+        self.validator_class.assert_called_once_with(
+            allow_local_dependencies=False, registry_data=self.registry_data)
+
+    def test_invalidate_rebuilds_validator(self):
+        """Test that invalidate makes the next validation build a new validator."""
+        self.validator.validate_package(Path("pkg"))
+        self.validator.invalidate()
+        self.validator.validate_package(Path("pkg"))
+        self.validator.validate_package(Path("pkg"))
+
+        self.assertEqual(self.validator_class.call_count, 2)
+
+    def test_registry_data_setter_rebuilds_validator(self):
+        """Test that assigning registry_data binds the next validator to the new data."""
+        self.validator.validate_package(Path("pkg"))
+        new_registry_data = {"repositories": [{"name": "repo", "packages": []}]}
+        self.validator.registry_data = new_registry_data
+        self.validator.validate_package(Path("pkg"))
+
+        self.assertEqual(self.validator_class.call_count, 2)
+        self.assertIs(self.validator_class.call_args.kwargs["registry_data"], new_registry_data)
+
+
+if __name__ == '__main__':
+    unittest.main()